@@ -8,7 +8,8 @@ from os import getenv
 
 app = Flask(__name__)
 app.register_blueprint(app_views)
-cors = CORS(app, resources={r"/api/v1/*": {"origins": "0.0.0.0"}})
+cors = CORS(app, resources={r"/api/v1/*": {"origins": "0.0.0.0"}},
+            expose_headers=["X-Next-Cursor"])
 
 
 @app.teardown_appcontext
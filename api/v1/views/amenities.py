@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 """A view for Amenity objects that handles all default RESTFul API actions"""
 from api.v1.views import app_views
+from api.v1.views.pagination import page_args, page_response, storage_page
 from flask import jsonify, abort, request
 from models import storage
 from models.amenity import Amenity
@@ -9,9 +10,9 @@ from models.amenity import Amenity
 @app_views.route("/amenities", methods=["GET"], strict_slashes=False)
 def get_amenities():
     """Retrieves the list of all Amenity objects"""
-    all_amenities = storage.all(Amenity).values()
-    list_amenities = [amenity.to_dict() for amenity in all_amenities]
-    return jsonify(list_amenities)
+    limit, after = page_args()
+    all_amenities = storage_page(Amenity, limit, after)
+    return page_response(all_amenities, limit)
 
 
 @app_views.route("/amenities/<amenity_id>", methods=["GET"],
@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 """A view for City objects that handles all default RESTFul API actions"""
 from api.v1.views import app_views
+from api.v1.views.pagination import page_args, page_response
 from flask import jsonify, abort, request
 from models import storage
 from models.state import State
@@ -15,9 +16,9 @@ def get_cities_by_state(state_id):
     if state is None:
         abort(404)
 
-    all_cities = state.cities
-    list_cities = [city.to_dict() for city in all_cities]
-    return jsonify(list_cities)
+    limit, after = page_args()
+    all_cities = storage.filter(City, limit, after, state_id=state.id)
+    return page_response(all_cities, limit)
 
 
 @app_views.route("/cities/<city_id>", methods=["GET"], strict_slashes=False)
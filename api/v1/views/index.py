@@ -1,14 +1,9 @@
 #!/usr/bin/python3
 """Index"""
-from flask import jsonify
+from flask import abort, jsonify
 from api.v1.views import app_views
 from models import storage
-from models.amenity import Amenity
-from models.city import City
-from models.place import Place
-from models.review import Review
-from models.state import State
-from models.user import User
+from os import getenv
 
 
 @app_views.route('/status', methods=['GET'], strict_slashes=False)
@@ -20,13 +15,23 @@ def status():
 @app_views.route('/stats', methods=['GET'], strict_slashes=False)
 def stats():
     """An endpoint that retrieves the number of each objects by type"""
+    counts = storage.counts()
     stats_data = {
-        'amenities': storage.count(Amenity),
-        'cities': storage.count(City),
-        'places': storage.count(Place),
-        'reviews': storage.count(Review),
-        'states': storage.count(State),
-        'users': storage.count(User)
+        'amenities': counts['Amenity'],
+        'cities': counts['City'],
+        'places': counts['Place'],
+        'reviews': counts['Review'],
+        'states': counts['State'],
+        'users': counts['User']
     }
 
     return jsonify(stats_data)
+
+
+@app_views.route('/metrics', methods=['GET'], strict_slashes=False)
+def metrics():
+    """An endpoint that returns the statistics of the storage engine, such
+    as its connection pool, only when HBNB_API_METRICS=1 turns it on"""
+    if getenv("HBNB_API_METRICS") != "1":
+        abort(404)
+    return jsonify(storage.metrics())
@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+"""Keyset pagination helpers shared by the list views"""
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from flask import abort, jsonify, request
+from models import storage
+from models.base_model import time
+
+
+def encode_cursor(obj):
+    """returns the opaque cursor pointing just after obj"""
+    key = "{} {}".format(obj.created_at.strftime(time), obj.id)
+    return urlsafe_b64encode(key.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """returns the (created_at, id) pair hidden in cursor"""
+    created_at, id = urlsafe_b64decode(cursor.encode()).decode().split(" ")
+    return (datetime.strptime(created_at, time), id)
+
+
+def page_args():
+    """returns the (limit, after) pair given in the query string"""
+    limit = request.args.get("limit")
+    after = request.args.get("after")
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            abort(400, description="Invalid limit")
+        if limit < 1:
+            abort(400, description="Invalid limit")
+    if after is not None:
+        try:
+            after = decode_cursor(after)
+        except ValueError:
+            abort(400, description="Invalid cursor")
+    return limit, after
+
+
+def storage_page(cls, limit, after):
+    """returns the page of the objects of cls given by limit and after,
+    or all of them if neither is given"""
+    if limit is None and after is None:
+        return list(storage.stream(cls))
+    return list(storage.all(cls, limit, after).values())
+
+
+def page_response(page, limit, list_dicts=None):
+    """returns the JSON list of page, with the cursor of the next page in
+    the X-Next-Cursor header when page is full"""
+    if list_dicts is None:
+        list_dicts = [obj.to_dict() for obj in page]
+    response = jsonify(list_dicts)
+    if limit is not None and len(page) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(page[-1])
+    return response
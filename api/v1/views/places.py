@@ -1,13 +1,12 @@
 #!/usr/bin/python3
 """A view for Place objects that handles all default RESTFul API actions"""
 from api.v1.views import app_views
+from api.v1.views.pagination import page_args, page_response
 from flask import jsonify, abort, request
 from models import storage
 from models.city import City
 from models.place import Place
 from models.user import User
-from models.state import State
-from models.amenity import Amenity
 
 
 @app_views.route("/cities/<city_id>/places",
@@ -19,9 +18,9 @@ def get_places_by_city(city_id):
     if city is None:
         abort(404)
 
-    all_places = city.places
-    list_places = [place.to_dict() for place in all_places]
-    return jsonify(list_places)
+    limit, after = page_args()
+    all_places = storage.filter(Place, limit, after, city_id=city.id)
+    return page_response(all_places, limit)
 
 
 @app_views.route("/places/<place_id>", methods=["GET"], strict_slashes=False)
@@ -112,43 +111,22 @@ def search_places():
         abort(400, description="Not a JSON")
 
     data = request.get_json()
+    if type(data) is not dict:
+        abort(400, description="Not a JSON")
+
+    for key in ('states', 'cities', 'amenities'):
+        ids = data.get(key, [])
+        if type(ids) is not list or any(type(id) is not str for id in ids):
+            abort(400, description="Invalid " + key)
 
     states_ids = data.get('states', [])
     cities_ids = data.get('cities', [])
     amenities_ids = data.get('amenities', [])
 
-    if not states_ids and not cities_ids and not amenities_ids:
-        places = storage.all(Place).values()
-        list_places = [place.to_dict() for place in places]
-        return jsonify(list_places)
-
-    list_places = []
-    if states_ids:
-        states = [storage.get(State, state_id) for state_id in states_ids]
-        for state in states:
-            if state:
-                for city in state.cities:
-                    if city and city.id not in cities_ids:
-                        cities_ids.append(city.id)
-
-    if cities_ids:
-        cities = [storage.get(City, city_id) for city_id in cities_ids]
-        for city in cities:
-            if city:
-                for place in city.places:
-                    if place not in list_places:
-                        list_places.append(place)
-
-    if amenities_ids:
-        if not list_places:
-            list_places = storage.all(Place).values()
-        amenities = [
-            storage.get(Amenity, amenity_id) for amenity_id in amenities_ids
-        ]
-        list_places = [
-            place for place in list_places
-            if all([amenity in place.amenities for amenity in amenities])
-        ]
+    limit, after = page_args()
+    list_places = storage.search_places(states_ids, cities_ids,
+                                        amenities_ids, limit=limit,
+                                        after=after)
 
     places = []
     for place in list_places:
@@ -156,4 +134,4 @@ def search_places():
         place_dict.pop('amenities', None)
         places.append(place_dict)
 
-    return jsonify(places)
+    return page_response(list_places, limit, places)
@@ -5,10 +5,9 @@ that handles all default RESTFul API actions
 """
 from api.v1.views import app_views
 from flask import jsonify, abort
-from models import storage
+from models import storage, storage_t
 from models.amenity import Amenity
 from models.place import Place
-import os
 
 
 @app_views.route("/places/<place_id>/amenities",
@@ -16,19 +15,15 @@ import os
                  strict_slashes=False)
 def get_amenities_of_place(place_id):
     """Retrieves the list of all Amenity objects of a Place."""
-    place = storage.get(Place, place_id)
+    place = storage.get(Place, place_id, eager={"amenities": "joined"})
     if place is None:
         abort(404)
 
-    if os.getenv("HBNB_TYPE_STORAGE") == "db":
+    if storage_t == "db":
         amenities = place.amenities
-        list_amenities = [amenity.to_dict() for amenity in amenities]
     else:
-        amenities = place.amenity_ids
-        list_amenities = [
-            storage.get(Amenity, amenity_id).to_dict()
-            for amenity_id in amenities
-        ]
+        amenities = storage.get_many(Amenity, place.amenity_ids)
+    list_amenities = [amenity.to_dict() for amenity in amenities]
     return jsonify(list_amenities)
 
 
@@ -43,16 +38,17 @@ def delete_amenity_from_place(place_id, amenity_id):
     if place is None or amenity is None:
         abort(404)
 
-    if os.getenv("HBNB_TYPE_STORAGE") == "db":
+    if storage_t == "db":
         if amenity not in place.amenities:
             abort(404)
         place.amenities.remove(amenity)
+        storage.save()
     else:
         if amenity_id not in place.amenity_ids:
             abort(404)
-        place.amenity_ids.remove(amenity_id)
+        place.amenity_ids = place.amenity_ids - {amenity_id}
+        place.save()
 
-    storage.save()
     return jsonify({}), 200
 
 
@@ -67,14 +63,15 @@ def link_amenity_to_place(place_id, amenity_id):
     if place is None or amenity is None:
         abort(404)
 
-    if os.getenv("HBNB_TYPE_STORAGE") == "db":
+    if storage_t == "db":
         if amenity in place.amenities:
             return jsonify(amenity.to_dict()), 200
         place.amenities.append(amenity)
+        storage.save()
     else:
         if amenity_id in place.amenity_ids:
             return jsonify(amenity.to_dict()), 200
-        place.amenity_ids.append(amenity_id)
+        place.amenity_ids = place.amenity_ids | {amenity_id}
+        place.save()
 
-    storage.save()
     return jsonify(amenity.to_dict()), 201
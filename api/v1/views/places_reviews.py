@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 """A view for Review objects that handles all default RESTFul API actions"""
 from api.v1.views import app_views
+from api.v1.views.pagination import page_args, page_response
 from flask import jsonify, abort, request
 from models import storage
 from models.place import Place
@@ -17,9 +18,9 @@ def get_reviews_by_place(place_id):
     if place is None:
         abort(404)
 
-    all_reviews = place.reviews
-    list_reviews = [review.to_dict() for review in all_reviews]
-    return jsonify(list_reviews)
+    limit, after = page_args()
+    all_reviews = storage.filter(Review, limit, after, place_id=place.id)
+    return page_response(all_reviews, limit)
 
 
 @app_views.route("/reviews/<review_id>", methods=["GET"], strict_slashes=False)
@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 """A view for State objects that handles all default RESTFul API actions"""
 from api.v1.views import app_views
+from api.v1.views.pagination import page_args, page_response, storage_page
 from flask import jsonify, abort, request
 from models import storage
 from models.state import State
@@ -9,9 +10,9 @@ from models.state import State
 @app_views.route("/states", methods=["GET"], strict_slashes=False)
 def get_states():
     """Retrieves the list of all State objects"""
-    all_states = storage.all(State).values()
-    list_states = [state.to_dict() for state in all_states]
-    return jsonify(list_states)
+    limit, after = page_args()
+    all_states = storage_page(State, limit, after)
+    return page_response(all_states, limit)
 
 
 @app_views.route("/states/<state_id>", methods=["GET"], strict_slashes=False)
@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 """A view for User objects that handles all default RESTFul API actions"""
 from api.v1.views import app_views
+from api.v1.views.pagination import page_args, page_response, storage_page
 from flask import jsonify, abort, request
 from models import storage
 from models.user import User
@@ -9,9 +10,9 @@ from models.user import User
 @app_views.route("/users", methods=["GET"], strict_slashes=False)
 def get_users():
     """Retrieves the list of all User objects"""
-    all_users = storage.all(User).values()
-    list_users = [user.to_dict() for user in all_users]
-    return jsonify(list_users)
+    limit, after = page_args()
+    all_users = storage_page(User, limit, after)
+    return page_response(all_users, limit)
 
 
 @app_views.route("/users/<user_id>", methods=["GET"], strict_slashes=False)
@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+"""
+Compares the size, save time and load time of file.json with each
+compression codec available (see models/engine/compression.py), in the
+JSON format and as a binary snapshot
+
+Usage: ./benchmarks/bench_compression.py [number of reviews]
+"""
+
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+os.chdir(tempfile.mkdtemp())
+from models import storage  # noqa: E402
+from models.engine import compression  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.place import Place  # noqa: E402
+from models.review import Review  # noqa: E402
+
+
+def timed(function):
+    """returns the seconds taken by function(), best of three runs"""
+    best = None
+    for i in range(3):
+        start = perf_counter()
+        function()
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(reviews):
+    """saves and loads a store of reviews with each codec and format"""
+    places = [Place(name="Place {}".format(i)) for i in range(100)]
+    for place in places:
+        storage.new(place)
+    for i in range(reviews):
+        storage.new(Review(text="Review {}".format(i), user_id="u",
+                           place_id=places[i % 100].id))
+    objects = FileStorage._FileStorage__objects
+    print("{} objects".format(len(objects)))
+    print("{:<8}{:<8}{:>12}{:>12}{:>12}".format(
+        "format", "codec", "size (KB)", "save (s)", "load (s)"))
+
+    def reload():
+        """reloads storage from scratch"""
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        FileStorage._FileStorage__objects = objects
+
+    codecs = ["none", "gzip:1", "gzip"]
+    codecs += [name for name in compression.codecs if name != "gzip"]
+    for file_format in ("json", "binary"):
+        FileStorage._FileStorage__format = file_format
+        for codec in codecs:
+            FileStorage._FileStorage__compress = codec
+            save = timed(storage.compact)
+            load = timed(reload)
+            print("{:<8}{:<8}{:>12}{:>12.3f}{:>12.3f}".format(
+                file_format, codec, os.path.getsize("file.json") // 1024,
+                save, load))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
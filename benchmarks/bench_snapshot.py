@@ -0,0 +1,95 @@
+#!/usr/bin/python3
+"""
+Compares the size and load time of file.json in the JSON format and as a
+binary snapshot (see models/engine/snapshot.py)
+
+Usage: ./benchmarks/bench_snapshot.py [number of reviews]
+"""
+
+import json
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+os.chdir(tempfile.mkdtemp())
+from models import storage  # noqa: E402
+from models.engine import snapshot  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.place import Place  # noqa: E402
+from models.review import Review  # noqa: E402
+from models.state import State  # noqa: E402
+
+
+def timed(function):
+    """returns the seconds taken by function(), best of three runs"""
+    best = None
+    for i in range(3):
+        start = perf_counter()
+        function()
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def reload():
+    """reloads storage from scratch"""
+    FileStorage._FileStorage__objects = {}
+    storage.reload()
+
+
+def main(reviews):
+    """writes a store of reviews in both formats and prints the results"""
+    state = State(name="California")
+    storage.new(state)
+    places = [Place(name="Place {}".format(i), amenity_ids=["a", "b"])
+              for i in range(100)]
+    for place in places:
+        storage.new(place)
+    for i in range(reviews):
+        storage.new(Review(text="Review {}".format(i), user_id="u",
+                           place_id=places[i % 100].id))
+    key = sorted(storage.all())[len(storage.all()) // 2]
+    storage.compact()
+    with open("file.json", "r") as f:
+        text = f.read()
+    FileStorage._FileStorage__format = "binary"
+    storage.compact()
+    with open("file.json", "rb") as f:
+        binary = f.read()
+    print("{} objects".format(len(storage.all())))
+    print("{:<10}{:>12}{:>12}{:>12}{:>12}".format(
+        "format", "size (KB)", "decode (s)", "reload (s)", "get (ms)"))
+
+    with open("file.json", "w") as f:
+        f.write(text)
+    decode = timed(lambda: json.loads(text))
+    load = timed(reload)
+    get = timed(lambda: json.load(open("file.json"))[key])
+    print("{:<10}{:>12}{:>12.3f}{:>12.3f}{:>12.3f}".format(
+        "json", len(text.encode()) // 1024, decode, load, get * 1000))
+
+    with open("file.json", "wb") as f:
+        f.write(binary)
+
+    def read_all():
+        """decodes every record of the snapshot"""
+        with snapshot.Snapshot("file.json") as snap:
+            list(snap)
+
+    def read_one():
+        """finds one record of the snapshot"""
+        with snapshot.Snapshot("file.json") as snap:
+            snap.get(key)
+
+    decode = timed(read_all)
+    load = timed(reload)
+    get = timed(read_one)
+    print("{:<10}{:>12}{:>12.3f}{:>12.3f}{:>12.3f}".format(
+        "binary", len(binary) // 1024, decode, load, get * 1000))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,102 @@
+#!/usr/bin/python3
+"""
+Compares FileStorage with the SQLite engine (see
+models/engine/sqlite_storage.py) on a store of reviews: saving it,
+starting up on it, counting, getting by id and listing the reviews of
+each place
+
+Each engine runs in processes of its own, as the engine is chosen when
+models is imported.
+
+Usage: ./benchmarks/bench_sqlite.py [number of reviews]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from time import perf_counter
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def write(reviews):
+    """creates the store and returns the seconds taken to save it"""
+    from models import storage
+    from models.place import Place
+    from models.review import Review
+    from models.state import State
+    from models.city import City
+    from models.user import User
+    state = State(name="California")
+    city = City(name="San Francisco", state_id=state.id)
+    user = User(email="a@b.c", password="pwd")
+    places = [Place(name="Place {}".format(i), city_id=city.id,
+                    user_id=user.id) for i in range(100)]
+    start = perf_counter()
+    for obj in [state, city, user] + places:
+        storage.new(obj)
+    for i in range(reviews):
+        storage.new(Review(text="Review {}".format(i), user_id=user.id,
+                           place_id=places[i % 100].id))
+    storage.save()
+    return {"save": perf_counter() - start}
+
+
+def read(reviews):
+    """returns the seconds taken to start up on the store and query it"""
+    start = perf_counter()
+    from models import storage
+    from models.place import Place
+    from models.review import Review
+    results = {"start": perf_counter() - start}
+    start = perf_counter()
+    count = storage.count(Review)
+    results["count"] = perf_counter() - start
+    assert count == reviews
+    step = max(reviews // 1000, 1)
+    ids = [obj.id for obj in storage.stream(Review)][::step]
+    start = perf_counter()
+    for id in ids:
+        storage.get(Review, id)
+    results["get"] = (perf_counter() - start) / len(ids)
+    places = list(storage.all(Place).values())
+    start = perf_counter()
+    for place in places:
+        len(place.reviews)
+    results["reviews"] = (perf_counter() - start) / len(places)
+    return results
+
+
+def run(engine, reviews):
+    """returns the results of engine, running each step in a process"""
+    env = dict(os.environ, HBNB_TYPE_STORAGE=engine, PYTHONPATH=root)
+    results = {}
+    cwd = tempfile.mkdtemp()
+    for step in ("write", "read"):
+        out = subprocess.check_output([sys.executable, __file__, step,
+                                       str(reviews)], cwd=cwd, env=env)
+        results.update(json.loads(out))
+    return results
+
+
+def main(reviews):
+    """prints the results of both engines"""
+    print("{} reviews".format(reviews))
+    print("{:<8}{:>10}{:>10}{:>12}{:>12}{:>14}".format(
+        "engine", "save (s)", "start (s)", "count (ms)", "get (ms)",
+        "reviews (ms)"))
+    for engine in ("file", "sqlite"):
+        r = run(engine, reviews)
+        print("{:<8}{:>10.3f}{:>10.3f}{:>12.3f}{:>12.3f}{:>14.3f}".format(
+            engine, r["save"], r["start"], r["count"] * 1000,
+            r["get"] * 1000, r["reviews"] * 1000))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] in ("write", "read"):
+        print(json.dumps({"write": write, "read": read}[sys.argv[1]](
+            int(sys.argv[2]))))
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
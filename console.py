@@ -77,9 +77,9 @@ class HBNBCommand(cmd.Cmd):
             return False
         if args[0] in classes:
             if len(args) > 1:
-                key = args[0] + "." + args[1]
-                if key in models.storage.all():
-                    print(models.storage.all()[key])
+                obj = models.storage.get(classes[args[0]], args[1])
+                if obj is not None:
+                    print(obj)
                 else:
                     print("** no instance found **")
             else:
@@ -94,9 +94,9 @@ class HBNBCommand(cmd.Cmd):
             print("** class name missing **")
         elif args[0] in classes:
             if len(args) > 1:
-                key = args[0] + "." + args[1]
-                if key in models.storage.all():
-                    models.storage.all().pop(key)
+                obj = models.storage.get(classes[args[0]], args[1])
+                if obj is not None:
+                    models.storage.delete(obj)
                     models.storage.save()
                 else:
                     print("** no instance found **")
@@ -132,8 +132,8 @@ class HBNBCommand(cmd.Cmd):
             print("** class name missing **")
         elif args[0] in classes:
             if len(args) > 1:
-                k = args[0] + "." + args[1]
-                if k in models.storage.all():
+                obj = models.storage.get(classes[args[0]], args[1])
+                if obj is not None:
                     if len(args) > 2:
                         if len(args) > 3:
                             if args[0] == "Place":
@@ -147,8 +147,8 @@ class HBNBCommand(cmd.Cmd):
                                         args[3] = float(args[3])
                                     except:
                                         args[3] = 0.0
-                            setattr(models.storage.all()[k], args[2], args[3])
-                            models.storage.all()[k].save()
+                            setattr(obj, args[2], args[3])
+                            obj.save()
                         else:
                             print("** value missing **")
                     else:
@@ -7,8 +7,16 @@ from os import getenv
 
 
 storage_t = getenv("HBNB_TYPE_STORAGE")
+# the engine in use, "db" for MySQL, "sqlite" or "file"
+storage_engine = storage_t if storage_t in ("db", "sqlite") else "file"
+if storage_t == "sqlite":
+    # SQLite maps the same SQLAlchemy models as MySQL
+    storage_t = "db"
 
-if storage_t == "db":
+if storage_engine == "sqlite":
+    from models.engine.sqlite_storage import SQLiteStorage
+    storage = SQLiteStorage()
+elif storage_t == "db":
     from models.engine.db_storage import DBStorage
     storage = DBStorage()
 else:
@@ -0,0 +1,108 @@
+#!/usr/bin/python3
+"""
+Contains the codecs FileStorage can compress its files with
+
+gzip, bz2 and xz come with Python, zstd and lz4 are used when the
+zstandard and lz4 packages are installed. A codec is named as "gzip", or
+with a compression level as "gzip:1". Compressed files are recognized by
+their header when read, so files written with any codec, or none, can be
+read whatever the current setting.
+"""
+
+import bz2
+from contextlib import nullcontext
+import gzip
+import lzma
+from os.path import splitext
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+
+def _gzip_writer(f, level):
+    """returns a gzip writer into f"""
+    return gzip.GzipFile(fileobj=f, mode='wb', mtime=0,
+                         compresslevel=6 if level is None else level)
+
+
+def _bz2_writer(f, level):
+    """returns a bz2 writer into f"""
+    return bz2.BZ2File(f, 'wb', compresslevel=9 if level is None else level)
+
+
+def _xz_writer(f, level):
+    """returns an xz writer into f"""
+    return lzma.LZMAFile(f, 'wb', preset=level)
+
+
+def _zstd_writer(f, level):
+    """returns a zstd writer into f"""
+    compressor = zstandard.ZstdCompressor(level=3 if level is None else level)
+    return compressor.stream_writer(f, closefd=False)
+
+
+def _lz4_writer(f, level):
+    """returns an lz4 writer into f"""
+    return lz4.frame.LZ4FrameFile(f, 'wb', compression_level=level or 0)
+
+
+# exceptions raised when reading a corrupt file, with any codec
+errors = (EOFError, OSError, ValueError, lzma.LZMAError)
+# name: (header, extension, opener, writer) of each codec, the opener
+# returning a binary file reading the decompressed content of a path
+codecs = {"gzip": (b"\x1f\x8b", ".gz", gzip.open, _gzip_writer),
+          "bz2": (b"BZh", ".bz2", bz2.open, _bz2_writer),
+          "xz": (b"\xfd7zXZ\x00", ".xz", lzma.open, _xz_writer)}
+if zstandard is not None:
+    codecs["zstd"] = (b"\x28\xb5\x2f\xfd", ".zst", zstandard.open,
+                      _zstd_writer)
+if lz4 is not None:
+    codecs["lz4"] = (b"\x04\x22\x4d\x18", ".lz4", lz4.frame.open,
+                     _lz4_writer)
+
+
+def codec_for(path):
+    """returns the name of the codec given by the extension of path, or
+    "none" for any other extension"""
+    ext = splitext(path)[1]
+    for name, codec in codecs.items():
+        if codec[1] == ext:
+            return name
+    return "none"
+
+
+def detect(path):
+    """returns the name of the codec of the file at path, from its header,
+    or "none" for an uncompressed file"""
+    with open(path, 'rb') as f:
+        header = f.read(6)
+    for name, codec in codecs.items():
+        if header.startswith(codec[0]):
+            return name
+    return "none"
+
+
+def open_read(path):
+    """returns a binary file reading the decompressed content of the file
+    at path, whatever codec it was written with"""
+    name = detect(path)
+    if name == "none":
+        return open(path, 'rb')
+    return codecs[name][2](path, 'rb')
+
+
+def writer(f, codec):
+    """returns a binary file compressing what is written to it into the
+    open binary file f with codec, to use in a with block that leaves f
+    open once closed"""
+    name, sep, level = codec.partition(":")
+    if name in ("", "none"):
+        return nullcontext(f)
+    if name not in codecs:
+        raise ValueError("Unknown or unavailable codec: " + name)
+    return codecs[name][3](f, int(level) if level else None)
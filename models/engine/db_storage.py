@@ -7,17 +7,24 @@ import models
 from models.amenity import Amenity
 from models.base_model import BaseModel, Base
 from models.city import City
+from models.engine import pool
+from models.engine.query import parse
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
 from os import getenv
 import sqlalchemy
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy import and_, create_engine, func, literal, or_
+from sqlalchemy.orm import (joinedload, scoped_session, selectinload,
+                            sessionmaker)
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# loader options by name of the strategies eager can ask for: "selectin"
+# loads a relationship for all the rows at once with a second query (per
+# 500 rows), "joined" in the same query with a LEFT OUTER JOIN
+loaders = {"selectin": selectinload, "joined": joinedload}
 
 
 class DBStorage:
@@ -25,32 +32,175 @@ class DBStorage:
     __engine = None
     __session = None
 
-    def __init__(self):
-        """Instantiate a DBStorage object"""
-        HBNB_MYSQL_USER = getenv('HBNB_MYSQL_USER')
-        HBNB_MYSQL_PWD = getenv('HBNB_MYSQL_PWD')
-        HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
-        HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
+    def __init__(self, engine=None):
+        """Instantiate a DBStorage object on engine, or on the MySQL
+        database given by the HBNB_MYSQL_* variables with the pool set up
+        by the HBNB_DB_POOL_* ones (see pool.py)"""
         HBNB_ENV = getenv('HBNB_ENV')
-        self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
-                                      format(HBNB_MYSQL_USER,
-                                             HBNB_MYSQL_PWD,
-                                             HBNB_MYSQL_HOST,
-                                             HBNB_MYSQL_DB))
+        if engine is None:
+            HBNB_MYSQL_USER = getenv('HBNB_MYSQL_USER')
+            HBNB_MYSQL_PWD = getenv('HBNB_MYSQL_PWD')
+            HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
+            HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
+            engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
+                                   format(HBNB_MYSQL_USER,
+                                          HBNB_MYSQL_PWD,
+                                          HBNB_MYSQL_HOST,
+                                          HBNB_MYSQL_DB),
+                                   **pool.options())
+        self.__engine = engine
         if HBNB_ENV == "test":
             Base.metadata.drop_all(self.__engine)
 
-    def all(self, cls=None):
-        """query on the current database session"""
+    def all(self, cls=None, limit=None, after=None, eager=None):
+        """query on the current database session
+
+        With limit or after, and a cls, returns at most limit objects of
+        cls ordered by (created_at, id), starting after the (created_at,
+        id) pair given in after. With eager, and a cls, loads the
+        relationships it names along with the objects (see __options)."""
         new_dict = {}
         for clss in classes:
             if cls is None or cls is classes[clss] or cls is clss:
-                objs = self.__session.query(classes[clss]).all()
+                query = self.__session.query(classes[clss])
+                if cls is not None and (limit is not None or
+                                        after is not None):
+                    query = self.__page(classes[clss], query, limit, after)
+                if cls is not None and eager:
+                    query = query.options(*self.__options(classes[clss],
+                                                          eager))
+                objs = query.all()
                 for obj in objs:
                     key = obj.__class__.__name__ + '.' + obj.id
                     new_dict[key] = obj
         return (new_dict)
 
+    def search_places(self, states=(), cities=(), amenities=(),
+                      eager=None, limit=None, after=None):
+        """returns the places in the given states or cities (all places if
+        neither is given) that have every one of the given amenities, with
+        a single query, and the relationships named in eager
+
+        With limit or after, returns at most limit of them ordered by
+        (created_at, id), starting after the (created_at, id) pair given
+        in after."""
+        from models.place import place_amenity
+        query = self.__session.query(Place)
+        if eager:
+            query = query.options(*self.__options(Place, eager))
+        if states or cities:
+            in_cities = []
+            if states:
+                in_cities.append(City.state_id.in_(states))
+            if cities:
+                in_cities.append(City.id.in_(cities))
+            query = query.join(City, Place.city_id == City.id)
+            query = query.filter(or_(*in_cities))
+        if amenities:
+            amenity_ids = set(amenities)
+            having_all = self.__session.query(place_amenity.c.place_id).\
+                filter(place_amenity.c.amenity_id.in_(amenity_ids)).\
+                group_by(place_amenity.c.place_id).\
+                having(func.count(place_amenity.c.amenity_id) ==
+                       len(amenity_ids))
+            query = query.filter(Place.id.in_(having_all))
+        if limit is not None or after is not None:
+            query = self.__page(Place, query, limit, after)
+        return query.all()
+
+    def filter(self, cls, limit=None, after=None, **conditions):
+        """returns the list of objects of cls meeting every condition (see
+        query.py), selected by a WHERE clause
+
+        With limit or after, returns at most limit of them ordered by
+        (created_at, id), starting after the (created_at, id) pair given
+        in after."""
+        query = self.__filter(cls, conditions, limit, after)
+        return [] if query is None else query.all()
+
+    def find_one(self, cls, **conditions):
+        """returns an object of cls meeting every condition, or None"""
+        query = self.__filter(cls, conditions)
+        return None if query is None else query.first()
+
+    def __filter(self, cls, conditions, limit=None, after=None):
+        """returns the query of the objects of cls meeting conditions, or
+        None if cls is not a class of storage, raising ValueError for an
+        attribute that is not a column of cls"""
+        if type(cls) is str:
+            cls = classes.get(cls)
+        if cls not in classes.values():
+            return None
+        clauses = []
+        columns = sqlalchemy.inspect(cls).column_attrs
+        for attr, op, value in parse(conditions):
+            if attr not in columns:
+                raise ValueError("Unknown attribute in condition: " + attr)
+            column = getattr(cls, attr)
+            if op == "eq":
+                clauses.append(column.is_(None) if value is None
+                               else column == value)
+            elif op == "in":
+                clauses.append(column.in_(value))
+            elif op == "lt":
+                clauses.append(column < value)
+            elif op == "le":
+                clauses.append(column <= value)
+            elif op == "gt":
+                clauses.append(column > value)
+            else:
+                clauses.append(column >= value)
+        query = self.__session.query(cls).filter(*clauses)
+        if limit is not None or after is not None:
+            query = self.__page(cls, query, limit, after)
+        return query
+
+    def __options(self, cls, eager):
+        """returns the loader options of the relationships of cls named in
+        eager, by path to the name of their strategy (see loaders)
+
+        A path is a relationship of cls, or a dotted chain of them such as
+        "cities.places" from State. Every relationship of a path is loaded
+        with its strategy, so a page listing states, their cities and the
+        places of those cities takes a fixed number of queries instead of
+        one for each state and each city."""
+        options = []
+        for path, strategy in eager.items():
+            if strategy not in loaders:
+                raise ValueError("Unknown loader strategy: " + strategy)
+            option = None
+            target = cls
+            for name in path.split("."):
+                attr = getattr(target, name)
+                if option is None:
+                    option = loaders[strategy](attr)
+                else:
+                    option = getattr(option, strategy + "load")(attr)
+                target = attr.property.mapper.class_
+            options.append(option)
+        return options
+
+    def __page(self, cls, query, limit, after):
+        """restricts query to a page of cls, in (created_at, id) order"""
+        query = query.order_by(cls.created_at, cls.id)
+        if after is not None:
+            created_at, id = after
+            query = query.filter(or_(cls.created_at > created_at,
+                                     and_(cls.created_at == created_at,
+                                          cls.id > id)))
+        if limit is not None:
+            query = query.limit(limit)
+        return query
+
+    def stream(self, cls=None, batch_size=1000):
+        """yields the objects of cls, or of every class, fetching the rows
+        batch_size at a time instead of loading whole tables"""
+        for clss in classes:
+            if cls is None or cls is classes[clss] or cls is clss:
+                query = self.__session.query(classes[clss])
+                for obj in query.yield_per(batch_size):
+                    yield obj
+
     def new(self, obj):
         """add the object to the current database session"""
         self.__session.add(obj)
@@ -75,13 +225,15 @@ class DBStorage:
         """call remove() method on the private session attribute"""
         self.__session.remove()
 
-    def get(self, cls, id):
+    def get(self, cls, id, eager=None):
         """
         Retrieve an object from storage by its class name and ID.
 
         Args:
             cls (str): The name of the class to retrieve the object for.
             id (int): The ID of the object to retrieve.
+            eager (dict): The relationships to load along with the object,
+                see __options.
 
         Returns:
             The object with the matching class name and ID if found,
@@ -90,21 +242,49 @@ class DBStorage:
         if cls not in classes.values():
             return None
 
-        all_obj_cls = models.storage.all(cls)
-        for obj in all_obj_cls.values():
-            if obj.id == id:
-                return obj
-        return None
+        if eager:
+            return self.__session.get(cls, id,
+                                      options=self.__options(cls, eager))
+        return self.__session.get(cls, id)
+
+    def get_many(self, cls, ids, eager=None):
+        """returns the list of the objects of cls whose id is in ids, in
+        the order of ids, with a single query, and the relationships named
+        in eager"""
+        if type(cls) is str:
+            cls = classes.get(cls)
+        if cls not in classes.values():
+            return []
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return []
+        query = self.__session.query(cls).filter(cls.id.in_(ids))
+        if eager:
+            query = query.options(*self.__options(cls, eager))
+        found = {obj.id: obj for obj in query}
+        return [found[id] for id in ids if id in found]
 
     def count(self, cls=None):
         """count the number of objects in storage"""
         if cls is not None:
-            cls_count = len(models.storage.all(cls).values())
-            return cls_count
-
-        all_clss = classes.values()
-        total_count = 0
-        for clss in all_clss:
-            clss_count = len(models.storage.all(clss).values())
-            total_count += clss_count
-        return total_count
+            if type(cls) is str:
+                cls = classes.get(cls)
+            if cls not in classes.values():
+                return 0
+            return self.__session.query(func.count(cls.id)).scalar()
+        return sum(self.counts().values())
+
+    def metrics(self):
+        """returns the statistics of the connection pool"""
+        engine_pool = self.__engine.pool
+        if isinstance(engine_pool, pool.MeteredQueuePool):
+            return {"pool": engine_pool.stats()}
+        return {"pool": {"status": engine_pool.status()}}
+
+    def counts(self):
+        """returns the number of objects in storage of each class name,
+        using a single query over all the tables"""
+        queries = [self.__session.query(literal(name), func.count(cls.id))
+                   for name, cls in classes.items()]
+        rows = queries[0].union_all(*queries[1:]).all()
+        return {name: count for name, count in rows}
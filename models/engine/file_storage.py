@@ -3,18 +3,164 @@
 Contains the FileStorage class
 """
 
+import atexit
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+from datetime import datetime
+import io
+from itertools import islice
 import json
 import models
+import multiprocessing
+import multiprocessing.connection
 from models.amenity import Amenity
-from models.base_model import BaseModel
+from models.engine import compression
+from models.engine.json_stream import iterload
+from models.engine.locks import FileLock, NoLock, ReadWriteLock
+from models.engine import query, snapshot
+from models.base_model import BaseModel, time as time_fmt
 from models.city import City
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+from os import (O_RDONLY, close as close_fd, fstat, fsync, getenv,
+                getpid, open as open_fd, remove, replace, stat)
+from os.path import dirname, exists, splitext
+from threading import Condition, Event, Lock, Thread, Timer
+from time import monotonic
+import traceback
+from zlib import crc32
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# attributes stored for the objects of each class: those of BaseModel and
+# the class attributes holding their defaults, by class name
+fields = {name: {"id", "created_at", "updated_at"} |
+          {attr for attr, value in vars(cls).items() if
+           not attr.startswith("_") and not callable(value) and
+           not isinstance(value, property)}
+          for name, cls in classes.items()}
+# attributes holding the id of a parent object, or a collection of such
+# ids, by class name
+foreign_keys = {"City": ("state_id",),
+                "Place": ("city_id", "user_id", "amenity_ids"),
+                "Review": ("place_id", "user_id")}
+# secondary indexes declared on other attributes, by class name: "hash"
+# answers equality and "in" conditions, "sorted" ranges as well (see
+# filter), from HBNB_FILE_INDEXES such as "Place.price_by_night:sorted"
+indexes = {}
+for _declared in getenv("HBNB_FILE_INDEXES", "").split(","):
+    if _declared.strip():
+        _attr, _sep, _kind = _declared.strip().partition(":")
+        _name, _sep, _attr = _attr.partition(".")
+        if _name not in classes or not _attr or \
+                _kind not in ("hash", "sorted"):
+            raise ValueError("Invalid HBNB_FILE_INDEXES entry: " + _declared)
+        indexes.setdefault(_name, {})[_attr] = _kind
+# attributes with a hash index, kept up to date by every change, and
+# attributes with a sorted index, built by the first query that needs it
+hash_indexes = {name: foreign_keys.get(name, ()) +
+                tuple(attr for attr, kind in indexes.get(name, {}).items()
+                      if kind == "hash")
+                for name in classes}
+sorted_indexes = {name: ("created_at",) +
+                  tuple(attr for attr, kind in indexes.get(name, {}).items()
+                        if kind == "sorted")
+                  for name in classes}
+# exceptions raised when reading a file that is corrupt or holds a record
+# of no known class
+read_errors = compression.errors + (AttributeError, KeyError, TypeError)
+# sorts after any id, in the (value, id) pairs of a sorted index
+_top = "\U0010ffff"
+
+
+def _text(value):
+    """returns the timestamp value, a string or a datetime read from a
+    binary snapshot, as a string"""
+    if type(value) is datetime:
+        return value.strftime(time_fmt)
+    return value
+
+
+def _fsync_policy(value):
+    """returns the seconds between two fsyncs under the HBNB_FILE_FSYNC
+    policy value: "always" (0), "never" (None) or a number of
+    milliseconds"""
+    if value == "always":
+        return 0
+    if value == "never":
+        return None
+    if not value.isdigit():
+        raise ValueError("Invalid HBNB_FILE_FSYNC: " + value)
+    return int(value) / 1000
+
+
+def _fsync_path(path):
+    """syncs the file or directory at path to disk, if it still exists"""
+    try:
+        fd = open_fd(path, O_RDONLY)
+    except FileNotFoundError:
+        return
+    try:
+        fsync(fd)
+    finally:
+        close_fd(fd)
+
+
+def _narrow(entries, start, stop, op, value):
+    """returns the (start, stop) bounds of the part of entries[start:stop],
+    a sorted index, whose values meet the condition op value"""
+    if op in ("eq", "ge"):
+        start = max(start, bisect_left(entries, (value,)))
+    elif op == "gt":
+        start = max(start, bisect_right(entries, (value, _top)))
+    if op in ("eq", "le"):
+        stop = min(stop, bisect_right(entries, (value, _top)))
+    elif op == "lt":
+        stop = min(stop, bisect_left(entries, (value,)))
+    return start, max(start, stop)
+
+
+def _build(path, start, stop, conn):
+    """sends through conn, a batch at a time, the (key, class name,
+    attributes) of the objects built from the lines of the file at path
+    starting between the byte offsets start and stop, each holding one
+    "<key>": <record> member of the JSON file, then True, or False if they
+    cannot be decoded
+
+    Run by the forked worker processes of a parallel reload. The objects
+    are sent as their attributes because unpickling them would import
+    models, which is still being imported during the first reload."""
+    def built(lines):
+        """returns the (key, class name, attributes) of the objects of
+        lines"""
+        jo = json.loads("{" + ",".join(lines) + "}")
+        return [(key, record["__class__"],
+                 classes[record["__class__"]](**record).__dict__)
+                for key, record in jo.items()]
+
+    try:
+        with open(path, "rb") as f:
+            f.seek(start)
+            lines = []
+            while start < stop:
+                line = f.readline()
+                if not line:
+                    break
+                start += len(line)
+                line = line.strip().rstrip(b",")
+                if line:
+                    lines.append(line.decode())
+                if len(lines) == 1000:
+                    conn.send(built(lines))
+                    lines = []
+            if lines:
+                conn.send(built(lines))
+        conn.send(True)
+    except (KeyError, TypeError, ValueError):
+        conn.send(False)
+    conn.close()
 
 
 class FileStorage:
@@ -24,73 +170,1284 @@ class FileStorage:
     __file_path = "file.json"
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # dictionary - the same objects by <class name> then by id
+    __index = {}
+    # the __objects dictionary that __index was built from
+    __indexed = None
+    # close() policy: "changed" reloads only if the JSON file changed,
+    # "always" reloads it after every request
+    __reload_mode = getenv("HBNB_FILE_RELOAD", "changed")
+    # (inode, size, mtime) of the JSON file when it was last read/written
+    __stamp = None
+    # set - keys of the objects the JSON file held at that time
+    __on_disk = set()
+    # journal mode: save() appends changed objects to the journal file
+    __journal = getenv("HBNB_FILE_JOURNAL") == "1"
+    # string - path to the journal, one {key: record or null} per line
+    __journal_path = __file_path + ".log"
+    # number of journal records that triggers a rewrite of the JSON file
+    __compact_every = int(getenv("HBNB_FILE_COMPACT", "1000"))
+    # number of records currently in the journal
+    __journaled = 0
+    # whether the journal ends with a line that cannot be decoded or has
+    # no newline, such as one cut short by a crash, after which nothing
+    # may be appended
+    __torn = False
+    # set - keys of the objects changed, added or deleted since the last
+    # save, whether by new(), delete() or an attribute write (mark_dirty)
+    __pending = set()
+    # dictionary - (object, JSON text) of each object as last encoded
+    __encoded = {}
+    # dictionary - ids of the objects by (<class name>, attribute), then
+    # by the value they hold in that attribute, for the attributes in
+    # hash_indexes: the foreign keys and the declared hash indexes
+    __children = {}
+    # lazy mode: reload() keeps the records read from the file in __raw,
+    # by class name then by id, and an object is built from its record
+    # the first time it is looked up (HBNB_FILE_LAZY=1)
+    __lazy = getenv("HBNB_FILE_LAZY") == "1"
+    __raw = {}
+    __hydrate_lock = Lock()
+    # lock taken by every public method: a ReadWriteLock when storage is
+    # shared between threads (HBNB_FILE_THREADSAFE=1) or written by the
+    # write-behind thread, a NoLock otherwise
+    __no_lock = NoLock()
+    __lock = (ReadWriteLock() if getenv("HBNB_FILE_THREADSAFE") == "1"
+              else __no_lock)
+    # shared mode: several processes use the same files, guarded by an
+    # fcntl lock on __file_path.lock, which also holds a generation number
+    # incremented by every write (HBNB_FILE_SHARED=1)
+    __shared = getenv("HBNB_FILE_SHARED") == "1"
+    __file_lock = FileLock(__file_path + ".lock")
+    # fsync policy, as the seconds between two fsyncs: 0 for "always",
+    # None for "never", or the number of milliseconds given; a write made
+    # sooner than that after the last fsync is synced by a timer once the
+    # interval is over (HBNB_FILE_FSYNC)
+    __fsync = _fsync_policy(getenv("HBNB_FILE_FSYNC", "always"))
+    # monotonic time of the last fsync
+    __synced_at = 0.0
+    # set - paths of the files and directories written since then, and
+    # the timer that will sync them
+    __unsynced = set()
+    __sync_timer = None
+    __sync_lock = Lock()
+    # group commit: save() calls made while another thread is writing
+    # wait for it and are then covered by a single write
+    __commit = Condition()
+    __save_calls = 0
+    __saved_calls = 0
+    __saving = False
+    # write-behind: save() only marks the changes as unsaved and a thread
+    # flushes them every that many seconds, or as soon as that many
+    # objects are dirty (HBNB_FILE_WRITE_BEHIND, HBNB_FILE_FLUSH_AFTER)
+    __write_behind = float(getenv("HBNB_FILE_WRITE_BEHIND", "0"))
+    __flush_after = int(getenv("HBNB_FILE_FLUSH_AFTER", "1000"))
+    __unflushed = False
+    __flusher = None
+    __flusher_lock = Lock()
+    __wake = Event()
+    # sharded mode: each class is kept in its own file, file.<class>.json,
+    # or spread by id hash over file.<class>.<n>.json for the classes
+    # given in HBNB_FILE_SHARDS (e.g. "Review:8,Place:2"); a class is read
+    # on first use, and save() rewrites only the files holding changes
+    # (HBNB_FILE_SHARDED=1)
+    __sharded = getenv("HBNB_FILE_SHARDED") == "1"
+    __shard_counts = {name: int(count) for name, count in
+                      (item.split(":") for item in
+                       getenv("HBNB_FILE_SHARDS", "").split(",") if item)}
+    # set - names of the classes read from their files so far
+    __loaded = set()
+    # dictionary - (inode, size, mtime) of each file when last read/written
+    __shard_stamps = {}
+    # format of the file written by compact(): "json", or "binary" for a
+    # snapshot (see models/engine/snapshot.py); reads detect the format
+    # (HBNB_FILE_FORMAT)
+    __format = getenv("HBNB_FILE_FORMAT", "json")
+    # codec compressing the JSON file, snapshot and shards: "none", "gzip",
+    # "gzip:1"... (see models/engine/compression.py), by default the one
+    # named by the extension of __file_path; reads detect the codec
+    # (HBNB_FILE_COMPRESS)
+    __compress = (getenv("HBNB_FILE_COMPRESS") or
+                  compression.codec_for(__file_path))
+    # parallel reload: number of worker processes building the objects of
+    # the JSON file, which is written one record per line for them to
+    # split it, uncompressed (HBNB_FILE_WORKERS, 1 to build them in this
+    # process)
+    __workers = int(getenv("HBNB_FILE_WORKERS", "1"))
+    # dictionary - sorted list of (value, id) by (<class name>, attribute),
+    # for the attributes in sorted_indexes, built by the first paginated
+    # all() or range filter() on them and kept up to date after
+    __sorted = {}
+
+    def __sync(self):
+        """rebuilds __index if __objects was replaced by another dict"""
+        if FileStorage.__indexed is not FileStorage.__objects:
+            FileStorage.__index = {}
+            FileStorage.__children = {}
+            FileStorage.__sorted = {}
+            FileStorage.__raw = {}
+            FileStorage.__indexed = FileStorage.__objects
+            for key, obj in FileStorage.__objects.items():
+                self.__add(key, obj)
+
+    def __need(self, *names):
+        """reads the files of the named classes, or of every class, that
+        were not read yet, in sharded mode"""
+        if not self.__sharded:
+            return
+        names = names or classes
+        if FileStorage.__loaded.issuperset(names):
+            return
+        with self.__lock.write, self.__disk():
+            for name in names:
+                if name not in FileStorage.__loaded:
+                    self.__load(name)
+
+    def __class_index(self, name):
+        """returns the id -> object dictionary of the class called name"""
+        self.__sync()
+        return self.__index.get(name, {})
+
+    def __add(self, key, obj):
+        """puts obj in __objects and in the indexes"""
+        name = obj.__class__.__name__
+        old = self.__objects.get(key)
+        if old is not obj:
+            self.__remove(key)
+        self.__objects[key] = obj
+        self.__index.setdefault(name, {})[obj.id] = obj
+        for attr in hash_indexes.get(name, ()):
+            self.__link(name, obj.id, attr, getattr(obj, attr, None))
+        if old is not obj:
+            for attr in sorted_indexes.get(name, ()):
+                self.__sort(name, obj.id, attr, getattr(obj, attr, None))
+
+    def __add_raw(self, key, record):
+        """puts record in __raw and in the indexes, in lazy mode"""
+        name, obj_id = key.split(".", 1)
+        self.__remove(key)
+        self.__raw.setdefault(name, {})[obj_id] = record
+        for attr in hash_indexes.get(name, ()):
+            self.__link(name, obj_id, attr, self.__field(name, record, attr))
+        for attr in sorted_indexes.get(name, ()):
+            if (name, attr) in self.__sorted:
+                self.__sort(name, obj_id, attr,
+                            self.__field(name, record, attr))
+
+    def __field(self, name, record, attr):
+        """returns the value of attr in record, or its class default, with
+        timestamps as datetimes"""
+        if attr not in record:
+            return getattr(classes[name], attr, None)
+        value = record[attr]
+        if attr in snapshot.timestamps and type(value) is str:
+            return datetime.strptime(value, time_fmt)
+        return value
+
+    def __object(self, name, obj_id):
+        """returns the object of the class called name with id obj_id,
+        building it from its record first in lazy mode, or None"""
+        obj = self.__index.get(name, {}).get(obj_id)
+        if obj is None and obj_id in self.__raw.get(name, ()):
+            self.__hydrate(name, (obj_id,))
+            obj = self.__index.get(name, {}).get(obj_id)
+        return obj
+
+    def __hydrate(self, name=None, ids=None):
+        """builds the objects of the records left in __raw, of the class
+        called name and with the given ids if any
+
+        An object is put in __objects before its record is dropped, and
+        only one thread builds objects at a time, so that readers holding
+        the read lock can call it."""
+        if not self.__raw:
+            return
+        with FileStorage.__hydrate_lock:
+            names = list(self.__raw) if name is None else [name]
+            for cls_name in names:
+                raw = self.__raw.get(cls_name, {})
+                for obj_id in (list(raw) if ids is None else ids):
+                    record = raw.get(obj_id)
+                    if record is None:
+                        continue
+                    obj = classes[cls_name](**record)
+                    self.__objects[cls_name + "." + obj_id] = obj
+                    self.__index.setdefault(cls_name, {})[obj_id] = obj
+                    del raw[obj_id]
+                if not raw:
+                    self.__raw.pop(cls_name, None)
+
+    def __keys(self, name):
+        """returns the keys of every object and record of the class called
+        name"""
+        return ([name + "." + obj_id for obj_id in self.__class_index(name)] +
+                [name + "." + obj_id for obj_id in self.__raw.get(name, ())])
+
+    def __records(self, name):
+        """yields the (key, JSON text) of every object and record of the
+        class called name"""
+        for obj_id, obj in self.__class_index(name).items():
+            key = name + "." + obj_id
+            yield key, self.__encode(key, obj)
+        for obj_id, record in list(self.__raw.get(name, {}).items()):
+            yield name + "." + obj_id, json.dumps(record, default=_text)
+
+    def __sort(self, name, obj_id, attr, value):
+        """inserts (value, id) in the sorted index of attr, if built
+
+        None is left out of sorted indexes, and an index that would mix
+        values that cannot be compared is dropped."""
+        entries = self.__sorted.get((name, attr))
+        if entries is not None and value is not None:
+            try:
+                insort(entries, (value, obj_id))
+            except TypeError:
+                del FileStorage.__sorted[(name, attr)]
+
+    def __unsort(self, name, obj_id, attr, value):
+        """removes (value, id) from the sorted index of attr, if built"""
+        entries = self.__sorted.get((name, attr))
+        if entries is not None and value is not None:
+            try:
+                i = bisect_left(entries, (value, obj_id))
+            except TypeError:
+                del FileStorage.__sorted[(name, attr)]
+                return
+            if i < len(entries) and entries[i] == (value, obj_id):
+                del entries[i]
+
+    def __sorted_index(self, name, attr):
+        """returns the sorted index of attr, building it if needed, or None
+        if its values cannot be compared"""
+        entries = self.__sorted.get((name, attr))
+        if entries is None:
+            entries = [(getattr(obj, attr, None), obj.id)
+                       for obj in self.__class_index(name).values()]
+            entries.extend((self.__field(name, record, attr), obj_id)
+                           for obj_id, record in
+                           self.__raw.get(name, {}).items())
+            entries = [entry for entry in entries if entry[0] is not None]
+            try:
+                entries.sort()
+            except TypeError:
+                return None
+            FileStorage.__sorted[(name, attr)] = entries
+        return entries
+
+    def __link(self, name, obj_id, attr, value):
+        """adds obj_id to the children of the parent id(s) in value"""
+        by_parent = self.__children.setdefault((name, attr), {})
+        if type(value) not in (set, list):
+            value = (value,)
+        for parent_id in value:
+            by_parent.setdefault(parent_id, {})[obj_id] = None
+
+    def __unlink(self, name, obj_id, attr, value):
+        """removes obj_id from the children of the parent id(s) in value"""
+        by_parent = self.__children.get((name, attr), {})
+        if type(value) not in (set, list):
+            value = (value,)
+        for parent_id in value:
+            siblings = by_parent.get(parent_id)
+            if siblings is not None:
+                siblings.pop(obj_id, None)
+                if not siblings:
+                    del by_parent[parent_id]
 
-    def all(self, cls=None):
-        """returns the dictionary __objects"""
+    def children(self, cls, attr, parent_id):
+        """returns the list of objects of cls whose attr is parent_id"""
+        return self.filter(cls, **{attr: parent_id})
+
+    def filter(self, cls, limit=None, after=None, **conditions):
+        """returns the list of objects of cls meeting every condition (see
+        query.py)
+
+        The objects are looked up in the index that selects the fewest of
+        them: the ids or a hash index for equality and "in", a sorted
+        index for equality and ranges. Only when no condition has an
+        index are all the objects of cls scanned. With limit or after,
+        returns at most limit of them in (created_at, id) order, starting
+        after the (created_at, id) pair given in after (see __in_order)."""
+        return self.__filter(cls, query.parse(conditions), limit, after,
+                             limit is not None or after is not None)
+
+    def find_one(self, cls, **conditions):
+        """returns an object of cls meeting every condition, or None"""
+        found = self.__filter(cls, query.parse(conditions), 1)
+        return found[0] if found else None
+
+    def __filter(self, cls, conditions, limit=None, after=None,
+                 ordered=False):
+        """returns at most limit objects of cls meeting the (attr, op,
+        value) conditions, ordered from after if ordered, raising
+        ValueError for an attribute that is not a field of cls"""
+        name = cls if type(cls) is str else cls.__name__
+        if name not in classes:
+            return []
+        for attr, op, value in conditions:
+            if attr not in fields[name]:
+                raise ValueError("Unknown attribute in condition: " + attr)
+        self.__need(name)
+        with self.__lock.read:
+            return self.__select(name, conditions, limit, after, ordered)
+
+    def __select(self, name, conditions, limit=None, after=None,
+                 ordered=False):
+        """does __filter for the class called name, once its file is read
+        and under the read lock"""
+        self.__sync()
+        ids = self.__plan(name, conditions)
+        if ordered:
+            objs = self.__in_order(name, ids, limit, after)
+        elif ids is None:
+            self.__hydrate(name)
+            objs = self.__class_index(name).values()
+        else:
+            objs = [self.__object(name, obj_id) for obj_id in list(ids)]
+        found = []
+        for obj in objs:
+            if obj is not None and all(
+                    query.matches(getattr(obj, attr, None), op, value)
+                    for attr, op, value in conditions):
+                found.append(obj)
+                if len(found) == limit:
+                    break
+        return found
+
+    def __in_order(self, name, ids, limit, after):
+        """yields the objects of the class called name with the given ids,
+        or all of them if ids is None, in (created_at, id) order from the
+        pair given in after
+
+        The sorted index of created_at is walked from after, unless the
+        ids are few enough to be sorted sooner: with k ids among n
+        entries, about limit * n / k entries are walked before limit of
+        them are found, so the ids are sorted when limit * n > k * k."""
+        entries = self.__sorted_index(name, "created_at")
+        if entries is not None:
+            start = 0 if after is None else bisect_right(entries,
+                                                         tuple(after))
+            if ids is None or limit is not None and \
+                    limit * (len(entries) - start) <= len(ids) * len(ids):
+                ids = None if ids is None else set(ids)
+                for i in range(start, len(entries)):
+                    obj_id = entries[i][1]
+                    if ids is None or obj_id in ids:
+                        yield self.__object(name, obj_id)
+                return
+        if ids is None:
+            self.__hydrate(name)
+            objs = list(self.__class_index(name).values())
+        else:
+            objs = [self.__object(name, obj_id) for obj_id in list(ids)]
+        objs = sorted((obj for obj in objs if obj is not None),
+                      key=lambda obj: (obj.created_at, obj.id))
+        for obj in objs:
+            if after is None or (obj.created_at, obj.id) > tuple(after):
+                yield obj
+
+    def __plan(self, name, conditions):
+        """returns the ids of the objects of the class called name that
+        may meet every condition, from the index selecting the fewest of
+        them, or None if no condition has an index
+
+        The conditions on an attribute with a sorted index narrow a slice
+        of it, and only the ids of the smallest slice are listed."""
+        best = None
+        slices = {}
+        for attr, op, value in conditions:
+            try:
+                if op in ("eq", "in") and (attr == "id" or
+                                           attr in hash_indexes[name]):
+                    found = self.__lookup(name, attr, op, value)
+                    if best is None or len(found) < len(best):
+                        best = found
+                elif op != "in" and attr in sorted_indexes[name]:
+                    entries = self.__sorted_index(name, attr)
+                    if entries is not None:
+                        entries, start, stop = slices.get(
+                            attr, (entries, 0, len(entries)))
+                        slices[attr] = (entries,) + _narrow(
+                            entries, start, stop, op, value)
+            except TypeError:
+                # an id that is not a string, a value that cannot be
+                # hashed or compared to the indexed values
+                continue
+        for entries, start, stop in slices.values():
+            if best is None or stop - start < len(best):
+                best = [entry[1] for entry in entries[start:stop]]
+        return best
+
+    def __lookup(self, name, attr, op, value):
+        """returns the ids of the objects of the class called name whose
+        attr meets the eq or in condition, from the ids or a hash index"""
+        values = (value,) if op == "eq" else value
+        if attr == "id":
+            return [obj_id for obj_id in values
+                    if self.__stored(name + "." + obj_id)]
+        by_value = self.__children.get((name, attr), {})
+        if op == "eq":
+            return by_value.get(value, {})
+        ids = {}
+        for item in values:
+            ids.update(by_value.get(item, {}))
+        return ids
+
+    def all(self, cls=None, limit=None, after=None, eager=None):
+        """returns the dictionary __objects, or a copy of it when storage
+        is shared between threads
+
+        With limit or after, and a cls, returns at most limit objects of
+        cls ordered by (created_at, id), starting after the (created_at,
+        id) pair given in after. eager is unused: relationships are index
+        lookups here (see DBStorage)."""
         if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
-        return self.__objects
+            name = cls if type(cls) is str else cls.__name__
+            self.__need(name)
+        else:
+            self.__need()
+        with self.__lock.read:
+            if cls is not None:
+                prefix = name + "."
+                if limit is not None or after is not None:
+                    return self.__page(name, limit, after)
+                self.__hydrate(name)
+                return {prefix + obj_id: obj
+                        for obj_id, obj in self.__class_index(name).items()}
+            self.__sync()
+            self.__hydrate()
+            if self.__lock is not FileStorage.__no_lock:
+                return dict(self.__objects)
+            return self.__objects
+
+    def __page(self, name, limit, after):
+        """returns a page of the objects of the class called name"""
+        entries = self.__sorted_index(name, "created_at")
+        start = 0 if after is None else bisect_right(entries, tuple(after))
+        stop = len(entries) if limit is None else start + limit
+        return {name + "." + obj_id: self.__object(name, obj_id)
+                for created_at, obj_id in entries[start:stop]}
+
+    def search_places(self, states=(), cities=(), amenities=(),
+                      eager=None, limit=None, after=None):
+        """returns the places in the given states or cities (all places if
+        neither is given) that have every one of the given amenities
+        (eager is unused, see all)
+
+        With limit or after, returns at most limit of them in (created_at,
+        id) order, starting after the (created_at, id) pair given in after
+        (see __in_order)."""
+        self.__need("City", "Place")
+        with self.__lock.read:
+            if states or cities:
+                city_ids = dict.fromkeys(cities)
+                for city in self.__select(
+                        "City", [("state_id", "in", states)]):
+                    city_ids[city.id] = None
+                places = {place.id: place for place in self.__select(
+                    "Place", [("city_id", "in", city_ids)])}
+            else:
+                places = None
+            if amenities:
+                self.__sync()
+                by_amenity = self.__children.get(("Place", "amenity_ids"),
+                                                 {})
+                having_all = None
+                for amenity_id in set(amenities):
+                    place_ids = by_amenity.get(amenity_id, {}).keys()
+                    if having_all is None:
+                        having_all = set(place_ids)
+                    else:
+                        having_all.intersection_update(place_ids)
+                if places is not None and len(places) < len(having_all):
+                    having_all = {place_id for place_id in places
+                                  if place_id in having_all}
+                elif places is not None:
+                    having_all = {place_id for place_id in having_all
+                                  if place_id in places}
+                places = having_all
+            if limit is not None or after is not None:
+                return list(islice(self.__in_order("Place", places, limit,
+                                                   after), limit))
+            if places is None:
+                self.__hydrate("Place")
+                return list(self.__class_index("Place").values())
+            return [obj for obj in (self.__object("Place", place_id)
+                                    for place_id in places)
+                    if obj is not None]
+
+    def stream(self, cls=None, batch_size=1000):
+        """yields the objects of cls, or all objects, without building a
+        dictionary of them (batch_size is unused, see DBStorage)"""
+        if cls is not None:
+            name = cls if type(cls) is str else cls.__name__
+            self.__need(name)
+        else:
+            self.__need()
+        with self.__lock.read:
+            if cls is None:
+                self.__sync()
+                self.__hydrate()
+                objs = list(self.__objects.values())
+            else:
+                self.__hydrate(name)
+                objs = list(self.__class_index(name).values())
+        for obj in objs:
+            yield obj
 
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
-        if obj is not None:
-            key = obj.__class__.__name__ + "." + obj.id
-            self.__objects[key] = obj
+        with self.__lock.write:
+            if obj is not None:
+                key = obj.__class__.__name__ + "." + obj.id
+                self.__need(obj.__class__.__name__)
+                self.__sync()
+                self.__add(key, obj)
+                FileStorage.__pending.add(key)
 
     def save(self):
-        """serializes __objects to the JSON file (path: __file_path)"""
-        json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+        """serializes __objects to the JSON file (path: __file_path)
 
-    def reload(self):
-        """deserializes the JSON file to __objects"""
+        In write-behind mode the changes are only marked as unsaved, for
+        the flusher thread to write them soon after (see flush)."""
+        if not self.__write_behind:
+            self.flush()
+            return
+        FileStorage.__unflushed = True
+        if FileStorage.__flusher is None:
+            self.__start_flusher()
+        if len(FileStorage.__pending) >= self.__flush_after:
+            FileStorage.__wake.set()
+
+    def __start_flusher(self):
+        """starts the write-behind thread, and flushes at exit
+
+        The thread walks the objects as this one changes them, so storage
+        is locked from then on even without HBNB_FILE_THREADSAFE=1."""
+        with FileStorage.__flusher_lock:
+            if FileStorage.__flusher is not None:
+                return
+            if FileStorage.__lock is FileStorage.__no_lock:
+                FileStorage.__lock = ReadWriteLock()
+            FileStorage.__flusher = Thread(target=self.__flush_loop,
+                                           daemon=True)
+            FileStorage.__flusher.start()
+            atexit.register(self.__flush_at_exit)
+
+    def __flush_loop(self):
+        """flushes every __write_behind seconds, or sooner when woken,
+        until write-behind is turned off"""
+        while self.__write_behind:
+            FileStorage.__wake.wait(self.__write_behind)
+            FileStorage.__wake.clear()
+            if FileStorage.__unflushed:
+                try:
+                    self.flush()
+                except Exception:
+                    traceback.print_exc()
+        with FileStorage.__flusher_lock:
+            FileStorage.__flusher = None
+
+    def __flush_at_exit(self):
+        """writes what is still unsaved when the interpreter exits"""
+        if FileStorage.__unflushed:
+            self.flush()
+
+    def flush(self):
+        """writes the changes to the files now
+
+        In journal mode only the objects changed, added or deleted since
+        the last save are appended to the journal, and the JSON file is
+        rewritten once the journal holds __compact_every records. In
+        shared mode what other processes saved meanwhile is merged first.
+
+        Calls made by other threads while a write is running are grouped
+        into the next write, which they all wait for."""
+        with FileStorage.__commit:
+            FileStorage.__save_calls += 1
+            call = FileStorage.__save_calls
+            while FileStorage.__saving:
+                FileStorage.__commit.wait()
+            if FileStorage.__saved_calls >= call:
+                return
+            FileStorage.__saving = True
+            covered = FileStorage.__save_calls
+        saved_calls = FileStorage.__saved_calls
+        FileStorage.__unflushed = False
+        try:
+            self.__save()
+            saved_calls = covered
+        finally:
+            with FileStorage.__commit:
+                if saved_calls != covered:
+                    FileStorage.__unflushed = True
+                FileStorage.__saving = False
+                FileStorage.__saved_calls = saved_calls
+                FileStorage.__commit.notify_all()
+
+    def __save(self):
+        """writes the changes to the files for flush()"""
+        with self.__lock.write, self.__disk(True):
+            self.__catch_up()
+            if self.__sharded:
+                self.__write_shards(FileStorage.__pending)
+                return
+            if (not self.__journal or FileStorage.__stamp is None or
+                    FileStorage.__torn):
+                self.compact()
+                return
+            if not FileStorage.__pending:
+                return
+            lines = []
+            for key in FileStorage.__pending:
+                obj = self.__objects.get(key)
+                if obj is not None:
+                    fragment = self.__encode(key, obj)
+                    FileStorage.__on_disk.add(key)
+                else:
+                    fragment = "null"
+                    FileStorage.__on_disk.discard(key)
+                lines.append("{" + json.dumps(key) + ": " + fragment + "}\n")
+            created = not exists(self.__journal_path)
+            with open(self.__journal_path, 'a') as f:
+                f.write("".join(lines))
+                synced = self.__flush(f, self.__journal_path)
+            if synced and created:
+                _fsync_path(dirname(self.__journal_path) or ".")
+            FileStorage.__pending = set()
+            FileStorage.__journaled += len(lines)
+            self.__written()
+            if FileStorage.__journaled >= self.__compact_every:
+                self.compact()
+
+    def compact(self):
+        """writes all of __objects to the JSON file and empties the journal
+
+        Only the objects changed since they were last written are encoded
+        again, the others reuse their cached JSON text. The file is written
+        under a temporary name then renamed, so readers see either the old
+        or the new file in full.
+
+        In sharded mode the files of every class read so far are rewritten
+        instead."""
+        with self.__lock.write, self.__disk(True):
+            self.__catch_up()
+            self.__sync()
+            names = sorted(set(self.__index) | set(self.__raw))
+            if self.__sharded:
+                self.__write_shards(key for name in names
+                                    if name in FileStorage.__loaded
+                                    for key in self.__keys(name))
+                return
+            keys = set()
+            if self.__format == "binary":
+                self.__write(self.__file_path,
+                             snapshot.dump(self.__pairs(names, keys)))
+            else:
+                self.__write(self.__file_path, self.__json(names, keys))
+            try:
+                remove(self.__journal_path)
+            except FileNotFoundError:
+                pass
+            else:
+                self.__sync_dir(self.__journal_path)
+            FileStorage.__pending = set()
+            FileStorage.__journaled = 0
+            FileStorage.__torn = False
+            FileStorage.__on_disk = keys
+            self.__written()
+
+    def __write(self, path, chunks):
+        """writes the strings or bytes in chunks to the file at path,
+        compressed with __compress, under a temporary name, then renames
+        it to path and syncs the directory, so that the new file is the
+        one found after a crash
+
+        The temporary file is removed if anything fails."""
+        tmp_path = "{}.{}.tmp".format(path, getpid())
+        try:
+            with open(tmp_path, 'wb') as f:
+                with compression.writer(f, self.__compress) as out:
+                    for chunk in chunks:
+                        if type(chunk) is str:
+                            chunk = chunk.encode()
+                        out.write(chunk)
+                synced = self.__flush(f, path)
+            replace(tmp_path, path)
+        except BaseException:
+            try:
+                remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        if synced:
+            _fsync_path(dirname(path) or ".")
+
+    def __json(self, names, keys):
+        """yields the text of the JSON file holding the classes called
+        names, one record at a time, adding their keys to keys"""
+        yield "{\n"
+        for name in names:
+            for key, fragment in self.__records(name):
+                separator = ",\n" if keys else ""
+                yield separator + json.dumps(key) + ": " + fragment
+                keys.add(key)
+        yield "\n}\n"
+
+    def __pairs(self, names, keys):
+        """yields the (key, record) of every object and record of the
+        classes called names, with datetime timestamps, adding their keys
+        to keys"""
+        for name in names:
+            for obj_id, obj in self.__class_index(name).items():
+                record = obj.to_dict()
+                record["created_at"] = obj.created_at
+                record["updated_at"] = obj.updated_at
+                keys.add(name + "." + obj_id)
+                yield name + "." + obj_id, record
+            for obj_id, record in list(self.__raw.get(name, {}).items()):
+                keys.add(name + "." + obj_id)
+                yield name + "." + obj_id, record
+
+    def __shard_path(self, key):
+        """returns the path to the file holding the object stored as key"""
+        name, obj_id = key.split(".", 1)
+        count = self.__shard_counts.get(name, 1)
+        root, ext = splitext(self.__file_path)
+        if count == 1:
+            return "{}.{}{}".format(root, name, ext)
+        shard = crc32(obj_id.encode()) % count
+        return "{}.{}.{}{}".format(root, name, shard, ext)
+
+    def __shard_paths(self, name):
+        """returns the paths to the files holding the class called name"""
+        count = self.__shard_counts.get(name, 1)
+        root, ext = splitext(self.__file_path)
+        if count == 1:
+            return ["{}.{}{}".format(root, name, ext)]
+        return ["{}.{}.{}{}".format(root, name, shard, ext)
+                for shard in range(count)]
+
+    def __write_shards(self, keys):
+        """rewrites the files holding the objects stored as keys"""
+        keys = set(keys)
+        texts = {self.__shard_path(key): [] for key in keys}
+        for name in {key.split(".")[0] for key in keys}:
+            for key, fragment in self.__records(name):
+                fragments = texts.get(self.__shard_path(key))
+                if fragments is not None:
+                    fragments.append(json.dumps(key) + ": " + fragment)
+        for path, fragments in texts.items():
+            self.__write(path, ("{\n", ",\n".join(fragments), "\n}\n"))
+            FileStorage.__shard_stamps[path] = self.__path_stamp(path)
+        FileStorage.__on_disk.difference_update(keys)
+        FileStorage.__on_disk.update(key for key in keys
+                                     if self.__stored(key))
+        FileStorage.__pending = set()
+        self.__written()
+
+    def __read_class(self, name):
+        """returns the records of the class called name from its files
+
+        A class with no file yet is read from the JSON file, if any, so
+        that the first save in sharded mode moves it to its files; the
+        second item returned tells if that was the case."""
+        jo = {}
+        found = False
+        for path in self.__shard_paths(name):
+            stamp = self.__path_stamp(path)
+            FileStorage.__shard_stamps[path] = stamp
+            if stamp is not None:
+                found = True
+                with compression.open_read(path) as f:
+                    jo.update(json.load(f))
+        if found or name not in classes:
+            return jo, False
+        try:
+            return ({key: record for key, record in self.__read()
+                     if record["__class__"] == name}, True)
+        except compression.errors:
+            return {}, False
+
+    def __load(self, name):
+        """reads the class called name from its files into __objects"""
+        jo, moved = self.__read_class(name)
+        self.__merge(jo.items(), {key for key in FileStorage.__on_disk
+                                  if key.split(".")[0] == name})
+        if moved:
+            FileStorage.__pending.update(jo)
+        FileStorage.__loaded.add(name)
+
+    def __stale_classes(self):
+        """returns the names of the classes read so far whose files were
+        written by another process since"""
+        return [name for name in FileStorage.__loaded
+                if any(self.__path_stamp(path) !=
+                       FileStorage.__shard_stamps.get(path)
+                       for path in self.__shard_paths(name))]
+
+    def __flush(self, f, path):
+        """flushes the file f, to be found at path, and returns whether it
+        was synced to disk now
+
+        Under an interval policy a file written too soon after the last
+        fsync is left to the timer (see __sync_later)."""
+        f.flush()
+        if self.__fsync is None:
+            return False
+        with FileStorage.__sync_lock:
+            now = monotonic()
+            if now - FileStorage.__synced_at < self.__fsync:
+                self.__sync_later(path)
+                return False
+            FileStorage.__synced_at = now
+        fsync(f.fileno())
+        return True
+
+    def __sync_dir(self, path):
+        """syncs the directory of path now, or later under an interval
+        policy, after a file was renamed to path or removed from it"""
+        if self.__fsync is None:
+            return
+        with FileStorage.__sync_lock:
+            now = monotonic()
+            if now - FileStorage.__synced_at < self.__fsync:
+                FileStorage.__unsynced.add(dirname(path) or ".")
+                self.__sync_later()
+                return
+            FileStorage.__synced_at = now
+        _fsync_path(dirname(path) or ".")
+
+    def __sync_later(self, path=None):
+        """adds path and its directory to the paths the timer syncs once
+        the interval since the last fsync is over, starting it if needed
+
+        The timer is not a daemon thread, so that exiting waits for it."""
+        if path is not None:
+            FileStorage.__unsynced.update((path, dirname(path) or "."))
+        if FileStorage.__sync_timer is None:
+            delay = FileStorage.__synced_at + self.__fsync - monotonic()
+            FileStorage.__sync_timer = Timer(max(0, delay),
+                                             self.__sync_unsynced)
+            FileStorage.__sync_timer.start()
+
+    def __sync_unsynced(self):
+        """syncs the paths written since the last fsync, for the timer"""
+        with FileStorage.__sync_lock:
+            paths = FileStorage.__unsynced
+            FileStorage.__unsynced = set()
+            FileStorage.__sync_timer = None
+            FileStorage.__synced_at = monotonic()
+        for path in paths:
+            _fsync_path(path)
+
+    def __disk(self, exclusive=False):
+        """returns the lock keeping other processes out of the files"""
+        if self.__shared:
+            return self.__file_lock.hold(exclusive)
+        return self.__no_lock
+
+    def __catch_up(self):
+        """merges what other processes saved since this one last read or
+        wrote the files, in shared mode"""
+        if not self.__shared:
+            return
+        if self.__sharded:
+            for name in self.__stale_classes():
+                self.__load(name)
+            return
+        stamp = self.__file_stamp()
+        if stamp is None or stamp == FileStorage.__stamp:
+            return
         try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
-        except:
+            self.__merge(self.__read())
+        except read_errors:
+            traceback.print_exc()
+
+    def __written(self):
+        """records that this process just wrote the files"""
+        if self.__shared:
+            self.__file_lock.increment()
+        FileStorage.__stamp = self.__file_stamp()
+
+    def __encode(self, key, obj):
+        """returns the JSON text of obj, encoding it only if it changed"""
+        cached = FileStorage.__encoded.get(key)
+        if (cached is None or cached[0] is not obj or
+                key in FileStorage.__pending):
+            cached = (obj, json.dumps(obj.to_dict()))
+            FileStorage.__encoded[key] = cached
+        return cached[1]
+
+    def mark_dirty(self, obj, name=None, value=None):
+        """returns the context of a with block setting obj's attribute
+        name to value, which records that obj changed since the last save
+        if it is stored (see __marking)"""
+        key = obj.__class__.__name__ + "." + str(obj.__dict__.get("id"))
+        if self.__objects.get(key) is not obj:
+            return self.__no_lock
+        return self.__marking(key, obj, name, value)
+
+    @contextmanager
+    def __marking(self, key, obj, name, value):
+        """marks the stored obj as changed for the with block setting its
+        attribute name to value
+
+        The indexes are updated before the attribute is set, so that a
+        new foreign key moves obj to the children of its new parent. The
+        block runs under the write lock, so that a flush cannot encode obj
+        between the two and keep its old text."""
+        with self.__lock.write:
+            FileStorage.__pending.add(key)
+            cls_name = obj.__class__.__name__
+            if name in hash_indexes.get(cls_name, ()):
+                self.__unlink(cls_name, obj.id, name,
+                              getattr(obj, name, None))
+                self.__link(cls_name, obj.id, name, value)
+            if name in sorted_indexes.get(cls_name, ()):
+                self.__unsort(cls_name, obj.id, name,
+                              getattr(obj, name, None))
+                self.__sort(cls_name, obj.id, name, value)
+            yield
+
+    def __read(self):
+        """yields the (key, record) pairs of the JSON file with the journal
+        replayed
+
+        The JSON file is decoded one record at a time, so that callers
+        building objects as they go never hold the whole decoded file; a
+        binary snapshot is read in place of it, its records holding
+        datetime timestamps. A journal line that cannot be decoded, such
+        as one cut short by a crash, ends the replay, and the next save
+        rewrites the JSON file instead of appending after that line."""
+        if snapshot.is_snapshot(self.__file_path):
+            with snapshot.Snapshot(self.__file_path) as f:
+                journal = self.__read_journal()
+                for key, record in f:
+                    if key not in journal:
+                        yield key, record
+        else:
+            with io.TextIOWrapper(compression.open_read(self.__file_path),
+                                  encoding="utf-8") as f:
+                journal = self.__read_journal()
+                for key, record in iterload(f):
+                    if key not in journal:
+                        yield key, record
+        for key, record in journal.items():
+            if record is not None:
+                yield key, record
+
+    def __read_journal(self):
+        """returns the last record (or None) of each key in the journal"""
+        journal = {}
+        journaled = 0
+        torn = False
+        try:
+            with open(self.__journal_path, 'r') as f:
+                for line in f:
+                    try:
+                        journal.update(json.loads(line))
+                    except (TypeError, ValueError):
+                        torn = True
+                        break
+                    journaled += 1
+                    torn = not line.endswith("\n")
+        except FileNotFoundError:
             pass
+        FileStorage.__journaled = journaled
+        FileStorage.__torn = torn
+        return journal
+
+    def __read_parallel(self):
+        """returns the (key, object) pairs of the JSON file with the
+        journal replayed, the objects being built by __workers processes,
+        or None if the file is compressed or not one record per line, or
+        the processes cannot be forked
+
+        The lines of the file are split by byte offset, each process
+        reading its own and sending the objects back as it builds them,
+        so the file is never held in memory whole."""
+        try:
+            context = multiprocessing.get_context("fork")
+        except ValueError:
+            return None
+        if (compression.detect(self.__file_path) != "none" or
+                snapshot.is_snapshot(self.__file_path)):
+            return None
+        with open(self.__file_path, "rb") as f:
+            journal = self.__read_journal()
+            if f.readline().rstrip() != b"{":
+                return None
+            start = f.tell()
+            base = max(start, fstat(f.fileno()).st_size - 64)
+            f.seek(base)
+            head, newline, last = f.read().rstrip().rpartition(b"\n")
+            if last != b"}" or not (newline or base == start):
+                return None
+            # the records are the lines from start to the last one, "}"
+            stop = base + len(head) + len(newline)
+            offsets = [start]
+            for i in range(1, self.__workers):
+                f.seek(start + (stop - start) * i // self.__workers)
+                f.readline()
+                offsets.append(max(offsets[-1], min(f.tell(), stop)))
+            offsets.append(stop)
+        workers = {}
+        for i in range(self.__workers):
+            if offsets[i] == offsets[i + 1]:
+                continue
+            reader, writer = context.Pipe(duplex=False)
+            process = context.Process(target=_build,
+                                      args=(self.__file_path, offsets[i],
+                                            offsets[i + 1], writer),
+                                      daemon=True)
+            process.start()
+            writer.close()
+            workers[reader] = (process, [])
+        failed = False
+        waiting = list(workers)
+        while waiting:
+            for reader in multiprocessing.connection.wait(waiting):
+                try:
+                    built = reader.recv()
+                except EOFError:
+                    built = False
+                if type(built) is bool:
+                    failed = failed or not built
+                    waiting.remove(reader)
+                    reader.close()
+                    continue
+                pairs = workers[reader][1]
+                for key, name, attributes in built:
+                    if key not in journal:
+                        obj = classes[name].__new__(classes[name])
+                        obj.__dict__.update(attributes)
+                        pairs.append((key, obj))
+        for process, built in workers.values():
+            process.join()
+        if failed:
+            return None
+        pairs = [pair for process, built in workers.values()
+                 for pair in built]
+        for key, record in journal.items():
+            if record is not None:
+                pairs.append((key, classes[record["__class__"]](**record)))
+        return pairs
+
+    def reload(self):
+        """deserializes the JSON file to __objects
+
+        In sharded mode only the classes read so far are read again, the
+        others are read on first use."""
+        with self.__lock.write, self.__disk():
+            if self.__sharded:
+                for name in list(FileStorage.__loaded):
+                    self.__load(name)
+                return
+            try:
+                stamp = self.__file_stamp()
+                self.__sync()
+                FileStorage.__sorted = {}
+                on_disk = set()
+                pairs = None
+                if self.__workers > 1 and not self.__lazy:
+                    pairs = self.__read_parallel()
+                if pairs is None:
+                    pairs = self.__read()
+                    if not self.__lazy:
+                        pairs = ((key, classes[record["__class__"]](**record))
+                                 for key, record in pairs)
+                for key, value in pairs:
+                    if self.__lazy:
+                        self.__add_raw(key, value)
+                    else:
+                        self.__add(key, value)
+                    on_disk.add(key)
+                FileStorage.__stamp = stamp
+                FileStorage.__on_disk = on_disk
+            except:
+                pass
+
+    def refresh(self):
+        """reloads only the objects that changed in the JSON file
+
+        Nothing is read if the file is the one last read or written. An
+        object is re-created when its updated_at differs from the file's,
+        and dropped when it was removed from the file, unless it changed
+        here since the last save.
+
+        In sharded mode only the files of the classes read so far are
+        checked, and read again if they changed."""
+        if self.__sharded:
+            if self.__stale_classes():
+                with self.__lock.write, self.__disk():
+                    for name in self.__stale_classes():
+                        self.__load(name)
+            return
+        stamp = self.__file_stamp()
+        if stamp is None or stamp == FileStorage.__stamp:
+            return
+        with self.__lock.write, self.__disk():
+            stamp = self.__file_stamp()
+            if stamp is None or stamp == FileStorage.__stamp:
+                return
+            try:
+                self.__merge(self.__read())
+            except read_errors:
+                traceback.print_exc()
+                return
+            FileStorage.__stamp = stamp
+
+    def __merge(self, records, on_disk=None):
+        """applies the (key, record) pairs read from the files to
+        __objects, leaving out the objects changed here since the last save
+
+        on_disk is the keys the files held when last read or written, of
+        which records is the new state (all of __on_disk by default). The
+        changed objects are all built before any is applied, so that a
+        record that cannot be read (see read_errors) leaves __objects as
+        it was."""
+        self.__sync()
+        if on_disk is None:
+            on_disk = FileStorage.__on_disk
+        pending = FileStorage.__pending
+        seen = set()
+        changed = []
+        for key, record in records:
+            seen.add(key)
+            if key in pending:
+                continue
+            obj = self.__objects.get(key)
+            updated_at = _text(record.get("updated_at"))
+            if obj is not None:
+                if obj.updated_at.strftime(time_fmt) == updated_at:
+                    continue
+            elif self.__stored(key):
+                name, obj_id = key.split(".", 1)
+                old = self.__raw[name][obj_id]
+                if _text(old.get("updated_at")) == updated_at:
+                    continue
+            cls = classes[record["__class__"]]
+            changed.append((key, record if self.__lazy else cls(**record)))
+        for key, value in changed:
+            if self.__lazy:
+                self.__add_raw(key, value)
+            else:
+                self.__add(key, value)
+        for key in on_disk - seen - pending:
+            self.__remove(key)
+        FileStorage.__on_disk = (FileStorage.__on_disk - on_disk) | seen
+
+    def __file_stamp(self):
+        """returns the (inode, size, mtime) of the JSON file and of the
+        journal, and the generation in shared mode, or None if there is
+        no JSON file"""
+        stamps = [self.__path_stamp(self.__file_path),
+                  self.__path_stamp(self.__journal_path)]
+        if stamps[0] is None:
+            return None
+        if self.__shared:
+            stamps.append(self.__file_lock.generation())
+        return tuple(stamps)
+
+    def __path_stamp(self, path):
+        """returns the (inode, size, mtime) of the file at path, or None"""
+        try:
+            st = stat(path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def __stored(self, key):
+        """tells if an object or a record is stored under key"""
+        if key in self.__objects:
+            return True
+        name, obj_id = key.split(".", 1)
+        return obj_id in self.__raw.get(name, ())
+
+    def __remove(self, key):
+        """takes the object or record stored under key out of __objects,
+        __raw and the indexes"""
+        name, obj_id = key.split(".", 1)
+        FileStorage.__encoded.pop(key, None)
+        hashed = hash_indexes.get(name, ())
+        ordered = [attr for attr in sorted_indexes.get(name, ())
+                   if (name, attr) in self.__sorted]
+        obj = self.__objects.pop(key, None)
+        if obj is not None:
+            self.__class_index(name).pop(obj_id, None)
+            values = {attr: getattr(obj, attr, None)
+                      for attr in hashed + tuple(ordered)}
+        else:
+            record = self.__raw.get(name, {}).pop(obj_id, None)
+            if record is None:
+                return
+            values = {attr: self.__field(name, record, attr)
+                      for attr in hashed + tuple(ordered)}
+        for attr in hashed:
+            self.__unlink(name, obj_id, attr, values[attr])
+        for attr in ordered:
+            self.__unsort(name, obj_id, attr, values[attr])
 
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
-        if obj is not None:
-            key = obj.__class__.__name__ + '.' + obj.id
-            if key in self.__objects:
-                del self.__objects[key]
+        with self.__lock.write:
+            if obj is not None:
+                key = obj.__class__.__name__ + '.' + obj.id
+                self.__need(obj.__class__.__name__)
+                if key in self.__objects:
+                    self.__remove(key)
+                    FileStorage.__pending.add(key)
 
     def close(self):
-        """call reload() method for deserializing the JSON file to objects"""
-        self.reload()
+        """reloads the JSON file, or only what changed in it (see refresh)"""
+        if self.__reload_mode == "always":
+            self.reload()
+        else:
+            self.refresh()
 
-    def get(self, cls, id):
+    def get(self, cls, id, eager=None):
         """Retrieve an object from storage by its class name and ID.
+        (eager is unused, see all)
         """
         if cls not in classes.values():
             return None
+        self.__need(cls.__name__)
+        with self.__lock.read:
+            self.__sync()
+            return self.__object(cls.__name__, id)
 
-        all_obj_cls = models.storage.all(cls)
-        for obj in all_obj_cls.values():
-            if obj.id == id:
-                return obj
-        return None
+    def get_many(self, cls, ids, eager=None):
+        """returns the list of the objects of cls whose id is in ids, in
+        the order of ids (eager is unused, see all)"""
+        name = cls if type(cls) is str else cls.__name__
+        if name not in classes:
+            return []
+        self.__need(name)
+        with self.__lock.read:
+            self.__sync()
+            objs = (self.__object(name, id) for id in dict.fromkeys(ids))
+            return [obj for obj in objs if obj is not None]
 
     def count(self, cls=None):
         """count the number of objects in storage"""
-        if cls is not None:
-            cls_count = len(models.storage.all(cls).values())
-            return cls_count
-
-        all_clss = classes.values()
-        total_count = 0
-        for clss in all_clss:
-            clss_count = len(models.storage.all(clss).values())
-            total_count += clss_count
-        return total_count
+        if cls is None:
+            return sum(self.counts().values())
+        name = cls if type(cls) is str else cls.__name__
+        self.__need(name)
+        with self.__lock.read:
+            return (len(self.__class_index(name)) +
+                    len(self.__raw.get(name, ())))
+
+    def metrics(self):
+        """returns no statistics, there is no connection pool to report on
+        (see DBStorage)"""
+        return {}
+
+    def counts(self):
+        """returns the number of objects in storage of each class name"""
+        self.__need()
+        with self.__lock.read:
+            return {name: (len(self.__class_index(name)) +
+                           len(self.__raw.get(name, ())))
+                    for name in classes}
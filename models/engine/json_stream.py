@@ -0,0 +1,80 @@
+#!/usr/bin/python3
+"""
+Contains the iterload function, decoding a JSON object a member at a time
+"""
+
+import json
+import re
+
+_decoder = json.JSONDecoder()
+_space = re.compile(r"\s*")
+_number_tail = re.compile(r"[-+.eE0-9]*")
+
+
+def iterload(f, chunk_size=65536):
+    """yields the (key, value) pairs of the JSON object in the text file f
+
+    The file is read chunk_size characters at a time and each value is
+    decoded as soon as it is complete, so only one member of the object is
+    held in memory besides the chunk being read. Raises ValueError if f
+    does not hold a JSON object."""
+    buf = ""
+    pos = 0
+    eof = False
+
+    def fill():
+        """reads the next chunk, dropping the text decoded so far"""
+        nonlocal buf, pos, eof
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buf = buf[pos:] + chunk
+        pos = 0
+
+    def peek():
+        """returns the next character that is not a space, or "" at EOF"""
+        nonlocal pos
+        while True:
+            pos = _space.match(buf, pos).end()
+            if pos < len(buf) or eof:
+                return buf[pos:pos + 1]
+            fill()
+
+    def decode():
+        """decodes the JSON value starting at the next character"""
+        nonlocal pos
+        while True:
+            peek()
+            try:
+                value, end = _decoder.raw_decode(buf, pos)
+            except ValueError:
+                if eof:
+                    raise
+                fill()
+                continue
+            if not eof and _number_tail.fullmatch(buf, end):
+                # a number may go on in the next chunk, after a "1", "1."
+                # or "1e" decoded as 1
+                fill()
+                continue
+            pos = end
+            return value
+
+    if peek() != "{":
+        raise ValueError("Expecting a JSON object")
+    pos += 1
+    if peek() == "}":
+        return
+    while True:
+        key = decode()
+        if type(key) is not str:
+            raise ValueError("Expecting a property name")
+        if peek() != ":":
+            raise ValueError("Expecting ':' delimiter")
+        pos += 1
+        yield key, decode()
+        delimiter = peek()
+        pos += 1
+        if delimiter == "}":
+            return
+        if delimiter != ",":
+            raise ValueError("Expecting ',' delimiter")
@@ -0,0 +1,174 @@
+#!/usr/bin/python3
+"""
+Contains the locks used by FileStorage
+"""
+
+from contextlib import contextmanager
+import os
+from threading import Condition, Lock, RLock, get_ident
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class ReadWriteLock:
+    """a reentrant lock held by many readers at once or by one writer
+
+    Use it as "with lock.read:" or "with lock.write:". A thread holding
+    the write side may take either side again, a thread holding only the
+    read side may not take the write side. Waiting writers go before new
+    readers so that a stream of GETs cannot starve a POST."""
+
+    def __init__(self):
+        """Instantiate an unlocked ReadWriteLock"""
+        self.__cond = Condition(Lock())
+        self.__readers = {}
+        self.__writer = None
+        self.__writes = 0
+        self.__waiting = 0
+        self.read = _Side(self.acquire_read, self.release_read)
+        self.write = _Side(self.acquire_write, self.release_write)
+
+    def acquire_read(self):
+        """blocks until the calling thread can read"""
+        me = get_ident()
+        with self.__cond:
+            if self.__writer != me and me not in self.__readers:
+                while self.__writer is not None or self.__waiting:
+                    self.__cond.wait()
+            self.__readers[me] = self.__readers.get(me, 0) + 1
+
+    def release_read(self):
+        """releases one read acquired by the calling thread"""
+        me = get_ident()
+        with self.__cond:
+            self.__readers[me] -= 1
+            if not self.__readers[me]:
+                del self.__readers[me]
+                if not self.__readers:
+                    self.__cond.notify_all()
+
+    def acquire_write(self):
+        """blocks until the calling thread is the only one holding the lock"""
+        me = get_ident()
+        with self.__cond:
+            if self.__writer == me:
+                self.__writes += 1
+                return
+            if me in self.__readers:
+                raise RuntimeError("cannot write while holding a read lock")
+            self.__waiting += 1
+            while self.__writer is not None or self.__readers:
+                self.__cond.wait()
+            self.__waiting -= 1
+            self.__writer = me
+            self.__writes = 1
+
+    def release_write(self):
+        """releases one write acquired by the calling thread"""
+        with self.__cond:
+            self.__writes -= 1
+            if not self.__writes:
+                self.__writer = None
+                self.__cond.notify_all()
+
+
+class FileLock:
+    """an advisory fcntl lock on a file, shared between processes
+
+    The file also holds a generation number that writers increment, so
+    other processes can tell that the data it guards changed. The lock
+    is reentrant, and held by one thread of the process at a time. On
+    systems without fcntl only the threads of one process are kept out
+    of each other."""
+
+    def __init__(self, path):
+        """Instantiate a FileLock on the file at path"""
+        self.__path = path
+        self.__guard = RLock()
+        self.__fd = None
+        self.__depth = 0
+        self.__exclusive = False
+
+    @contextmanager
+    def hold(self, exclusive=False):
+        """holds the lock, shared or exclusive, for a with block"""
+        self.acquire(exclusive)
+        try:
+            yield self
+        finally:
+            self.release()
+
+    def acquire(self, exclusive=False):
+        """blocks until the lock is held, shared or exclusive"""
+        self.__guard.acquire()
+        if self.__fd is None:
+            self.__fd = os.open(self.__path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None and (not self.__depth or
+                                  exclusive and not self.__exclusive):
+            fcntl.flock(self.__fd, fcntl.LOCK_EX if exclusive
+                        else fcntl.LOCK_SH)
+            self.__exclusive = exclusive
+        self.__depth += 1
+
+    def release(self):
+        """releases one acquire of the lock"""
+        self.__depth -= 1
+        if not self.__depth:
+            if fcntl is not None:
+                fcntl.flock(self.__fd, fcntl.LOCK_UN)
+            os.close(self.__fd)
+            self.__fd = None
+            self.__exclusive = False
+        self.__guard.release()
+
+    def generation(self):
+        """returns the generation number stored in the lock file"""
+        if self.__fd is None:
+            with self.hold():
+                return self.generation()
+        data = os.pread(self.__fd, 32, 0)
+        return int(data) if data else 0
+
+    def increment(self):
+        """adds one to the generation number, the lock must be exclusive"""
+        generation = self.generation() + 1
+        os.ftruncate(self.__fd, 0)
+        os.pwrite(self.__fd, str(generation).encode(), 0)
+        return generation
+
+
+class NoLock:
+    """stands in for a ReadWriteLock when only one thread uses storage"""
+
+    def __init__(self):
+        """Instantiate a NoLock"""
+        self.read = self
+        self.write = self
+
+    def __enter__(self):
+        """does nothing"""
+        return self
+
+    def __exit__(self, *exc):
+        """does nothing"""
+        return False
+
+
+class _Side:
+    """context manager taking one side of a ReadWriteLock"""
+
+    def __init__(self, acquire, release):
+        """Instantiate the side from its acquire and release methods"""
+        self.__acquire = acquire
+        self.__release = release
+
+    def __enter__(self):
+        """acquires this side of the lock"""
+        self.__acquire()
+
+    def __exit__(self, *exc):
+        """releases this side of the lock"""
+        self.__release()
+        return False
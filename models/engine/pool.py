@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+"""
+Contains the connection pool of DBStorage and its configuration
+
+The pool is set up from these variables, SQLAlchemy's defaults being
+used for those that are not set:
+    HBNB_DB_POOL_SIZE: connections kept open (5)
+    HBNB_DB_MAX_OVERFLOW: connections opened past the pool size under
+        load, and closed when given back (10)
+    HBNB_DB_POOL_TIMEOUT: seconds to wait for a connection before giving
+        up with a TimeoutError (30)
+    HBNB_DB_POOL_RECYCLE: seconds after which a connection is reopened,
+        to set below the idle timeout of the server or of a proxy (never)
+    HBNB_DB_POOL_PRE_PING: 1 to test each connection as it is checked
+        out, and replace it if it went stale, instead of failing the
+        request using it
+Size the pool to the number of threads serving requests: a request
+holds a connection from its first query to the end of the request.
+"""
+
+from os import getenv
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import QueuePool
+from threading import Lock
+from time import monotonic
+
+# create_engine() argument and type of each pool variable
+_variables = {"HBNB_DB_POOL_SIZE": ("pool_size", int),
+              "HBNB_DB_MAX_OVERFLOW": ("max_overflow", int),
+              "HBNB_DB_POOL_TIMEOUT": ("pool_timeout", float),
+              "HBNB_DB_POOL_RECYCLE": ("pool_recycle", int),
+              "HBNB_DB_POOL_PRE_PING": ("pool_pre_ping",
+                                        lambda value: value == "1")}
+
+
+def options():
+    """returns the create_engine() arguments setting up a MeteredQueuePool
+    as the HBNB_DB_POOL_* variables say"""
+    kwargs = {"poolclass": MeteredQueuePool}
+    for variable, (name, cast) in _variables.items():
+        value = getenv(variable)
+        if value:
+            kwargs[name] = cast(value)
+    return kwargs
+
+
+class MeteredQueuePool(QueuePool):
+    """a QueuePool keeping statistics of the connections checked out"""
+
+    def __init__(self, *args, **kwargs):
+        """Instantiate a MeteredQueuePool, see QueuePool"""
+        super().__init__(*args, **kwargs)
+        self.__lock = Lock()
+        self.__checkouts = 0
+        self.__waited = 0.0
+        self.__max_wait = 0.0
+        self.__timeouts = 0
+
+    def _do_get(self):
+        """checks a connection out, timing the wait for it"""
+        start = monotonic()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            wait = monotonic() - start
+            with self.__lock:
+                self.__checkouts += not timed_out
+                self.__timeouts += timed_out
+                self.__waited += wait
+                self.__max_wait = max(self.__max_wait, wait)
+
+    def stats(self):
+        """returns the state of the pool and its statistics since it was
+        created: the connections checked out, the overflow ones among
+        them, and the time spent waiting for a connection, opening it
+        included"""
+        with self.__lock:
+            return {"size": self.size(),
+                    "checked_out": self.checkedout(),
+                    "checked_in": self.checkedin(),
+                    "overflow": max(self.overflow(), 0),
+                    "checkouts": self.__checkouts,
+                    "timeouts": self.__timeouts,
+                    "wait_seconds": round(self.__waited, 6),
+                    "max_wait_seconds": round(self.__max_wait, 6)}
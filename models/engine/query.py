@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+"""
+Contains the conditions taken by the filter() and find_one() methods of
+the storage engines
+
+A condition is a keyword argument: attr=value holds for the objects
+whose attr equals value, attr__<op>=value for those whose attr compares
+to value with op, one of:
+    eq: attr == value
+    in: attr is one of the values in value
+    lt, le, gt, ge: attr <, <=, >, >= value
+so that storage.filter(Place, city_id=city.id, price_by_night__le=100)
+returns the places of city at 100 a night or less. Both engines raise
+ValueError for an unknown operator or an attribute that the objects of
+the class don't store.
+"""
+
+operators = ("eq", "in", "lt", "le", "gt", "ge")
+
+
+def parse(conditions):
+    """returns the (attr, op, value) triples of the keyword arguments in
+    conditions, raising ValueError for an unknown operator"""
+    triples = []
+    for key, value in conditions.items():
+        attr, sep, op = key.rpartition("__")
+        if not sep or not attr:
+            attr, op = key, "eq"
+        if op not in operators:
+            raise ValueError("Unknown operator in condition: " + key)
+        if op == "in":
+            value = list(value)
+        triples.append((attr, op, value))
+    return triples
+
+
+def matches(value, op, bound):
+    """tells if value meets the condition op bound
+
+    A list or set value, such as Place.amenity_ids, equals bound when it
+    holds it. A value that cannot be compared to bound does not meet a
+    range condition."""
+    if type(value) in (list, set):
+        if op == "eq":
+            return bound in value
+        if op == "in":
+            return any(item in value for item in bound)
+        return False
+    if op == "eq":
+        return value == bound
+    if op == "in":
+        return value in bound
+    try:
+        if op == "lt":
+            return value < bound
+        if op == "le":
+            return value <= bound
+        if op == "gt":
+            return value > bound
+        return value >= bound
+    except TypeError:
+        return False
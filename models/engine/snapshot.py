@@ -0,0 +1,232 @@
+#!/usr/bin/python3
+"""
+Contains the binary snapshot format of FileStorage
+
+A snapshot starts with MAGIC and holds, in order:
+    the rows, one per object: a JSON array of the number of the object's
+    class, a bit mask of the columns it has, and the values of those
+    columns, with created_at and updated_at as integer microseconds
+    since the epoch;
+    the schema: a JSON array of [class name, [column, ...]] pairs;
+    the index: the number of rows, a table of (key offset, row offset,
+    row length) sorted by key, then the keys;
+    the footer: the offsets of the schema and of the index, and MAGIC.
+The index lets a mapped snapshot find the row of a key by binary search.
+
+Run as a script to convert a JSON file to a snapshot or back, either of
+them compressed if their extension names a codec (see compression.py):
+    python3 -m models.engine.snapshot file.json file.snap.gz
+"""
+
+from datetime import datetime, timedelta
+import json
+import mmap
+from models.engine import compression
+import struct
+import sys
+
+MAGIC = b"HBNBSNP1"
+timestamps = ("created_at", "updated_at")
+_epoch = datetime(1970, 1, 1)
+_microsecond = timedelta(microseconds=1)
+_time_fmt = "%Y-%m-%dT%H:%M:%S.%f"
+_count = struct.Struct("<I")
+_entry = struct.Struct("<QQI")
+_key = struct.Struct("<H")
+_footer = struct.Struct("<QQ8s")
+
+
+def is_snapshot(path):
+    """tells if the file at path is a snapshot, compressed or not"""
+    try:
+        with compression.open_read(path) as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except compression.errors:
+        return False
+
+
+def dump(records):
+    """yields the bytes of the snapshot of the (key, record) pairs
+
+    A record is a dictionary such as to_dict() returns, whose timestamps
+    may be datetimes or strings."""
+    yield MAGIC
+    offset = len(MAGIC)
+    schema = []
+    columns = {}
+    entries = []
+    for key, record in records:
+        name = record["__class__"]
+        if name not in columns:
+            columns[name] = (len(schema), {})
+            schema.append([name, []])
+        number, positions = columns[name]
+        cells = []
+        for attr, value in record.items():
+            if attr == "__class__":
+                continue
+            if attr not in positions:
+                positions[attr] = len(positions)
+                schema[number][1].append(attr)
+            if attr in timestamps:
+                if type(value) is str:
+                    value = datetime.strptime(value, _time_fmt)
+                value = (value - _epoch) // _microsecond
+            cells.append((positions[attr], value))
+        cells.sort(key=lambda cell: cell[0])
+        mask = 0
+        for position, value in cells:
+            mask |= 1 << position
+        row = json.dumps([number, mask] + [value for position, value in cells],
+                         separators=(",", ":")).encode()
+        entries.append((key.encode(), offset, len(row)))
+        yield row
+        offset += len(row)
+    schema_offset = offset
+    text = json.dumps(schema).encode()
+    yield text
+    index_offset = schema_offset + len(text)
+    entries.sort()
+    yield _count.pack(len(entries))
+    key_offset = index_offset + _count.size + _entry.size * len(entries)
+    for key, row_offset, row_length in entries:
+        yield _entry.pack(key_offset, row_offset, row_length)
+        key_offset += _key.size + len(key)
+    for key, row_offset, row_length in entries:
+        yield _key.pack(len(key)) + key
+    yield _footer.pack(schema_offset, index_offset, MAGIC)
+
+
+class Snapshot:
+    """a snapshot file mapped in memory, read in full or by key
+
+    A compressed snapshot is decompressed to anonymous memory first."""
+
+    def __init__(self, path):
+        """Instantiate a Snapshot of the file at path"""
+        if compression.detect(path) == "none":
+            with open(path, 'rb') as f:
+                self.__map = mmap.mmap(f.fileno(), 0,
+                                       access=mmap.ACCESS_READ)
+        else:
+            with compression.open_read(path) as f:
+                data = f.read()
+            self.__map = mmap.mmap(-1, max(len(data), 1))
+            self.__map.write(data)
+        size = len(self.__map)
+        if size < len(MAGIC) + _footer.size or \
+                self.__map[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError("Not a snapshot: " + path)
+        schema_offset, index_offset, magic = _footer.unpack_from(
+            self.__map, size - _footer.size)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError("Truncated snapshot: " + path)
+        self.__schema = json.loads(self.__map[schema_offset:index_offset])
+        self.__count = _count.unpack_from(self.__map, index_offset)[0]
+        self.__table = index_offset + _count.size
+        # (class name, columns) by (class number, mask) of the rows read
+        self.__layouts = {}
+
+    def __enter__(self):
+        """returns the snapshot"""
+        return self
+
+    def __exit__(self, *exc):
+        """unmaps the snapshot"""
+        self.close()
+        return False
+
+    def __len__(self):
+        """returns the number of records of the snapshot"""
+        return self.__count
+
+    def __iter__(self):
+        """yields the (key, record) pairs of the snapshot, by key"""
+        for i in range(self.__count):
+            key, row_offset, row_length = self.__entry(i)
+            yield key, self.__record(row_offset, row_length)
+
+    def get(self, key):
+        """returns the record stored under key, or None"""
+        target = key.encode()
+        low, high = 0, self.__count
+        while low < high:
+            middle = (low + high) // 2
+            key_offset = _entry.unpack_from(
+                self.__map, self.__table + _entry.size * middle)[0]
+            if self.__key(key_offset) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.__count:
+            found, row_offset, row_length = self.__entry(low)
+            if found == key:
+                return self.__record(row_offset, row_length)
+        return None
+
+    def close(self):
+        """unmaps the snapshot"""
+        self.__map.close()
+
+    def __entry(self, i):
+        """returns the key, row offset and row length of entry i"""
+        key_offset, row_offset, row_length = _entry.unpack_from(
+            self.__map, self.__table + _entry.size * i)
+        return self.__key(key_offset).decode(), row_offset, row_length
+
+    def __key(self, key_offset):
+        """returns the bytes of the key at key_offset"""
+        length = _key.unpack_from(self.__map, key_offset)[0]
+        start = key_offset + _key.size
+        return self.__map[start:start + length]
+
+    def __layout(self, number, mask):
+        """returns the class name and the columns of the rows of class
+        number having the columns in mask"""
+        name, columns = self.__schema[number]
+        layout = (name, [column for position, column in enumerate(columns)
+                         if mask >> position & 1])
+        self.__layouts[(number, mask)] = layout
+        return layout
+
+    def __record(self, row_offset, row_length):
+        """returns the record of the row at row_offset, with datetimes as
+        timestamps"""
+        row = json.loads(self.__map[row_offset:row_offset + row_length])
+        layout = self.__layouts.get((row[0], row[1]))
+        if layout is None:
+            layout = self.__layout(row[0], row[1])
+        name, columns = layout
+        record = dict(zip(columns, row[2:]))
+        for attr in timestamps:
+            if attr in record:
+                record[attr] = _epoch + record[attr] * _microsecond
+        record["__class__"] = name
+        return record
+
+
+def convert(source, destination):
+    """writes the records of the file at source, a JSON file or a
+    snapshot, to destination in the other format, compressed with the
+    codec named by its extension if any"""
+    codec = compression.codec_for(destination)
+    if is_snapshot(source):
+        with Snapshot(source) as snap:
+            text = json.dumps({key: record for key, record in snap},
+                              default=lambda value: value.strftime(_time_fmt))
+        chunks = [text.encode()]
+    else:
+        with compression.open_read(source) as f:
+            chunks = dump(json.load(f).items())
+    with open(destination, 'wb') as f, compression.writer(f, codec) as out:
+        for chunk in chunks:
+            out.write(chunk)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: {} <source> <destination>".format(sys.argv[0]))
+        sys.exit(1)
+    convert(sys.argv[1], sys.argv[2])
@@ -0,0 +1,39 @@
+#!/usr/bin/python3
+"""
+Contains the class SQLiteStorage
+"""
+
+from models.engine.db_storage import DBStorage
+from models.engine import pool
+from os import getenv
+from sqlalchemy import create_engine, event
+
+
+class SQLiteStorage(DBStorage):
+    """interacts with an SQLite database file, for a single node that
+    needs indexed queries without a MySQL server
+
+    The database is in write-ahead log mode, so readers are not blocked
+    by the writer nor by each other."""
+
+    def __init__(self):
+        """Instantiate a SQLiteStorage on the file given by HBNB_SQLITE_DB,
+        hbnb.db by default, with the pool set up by the HBNB_DB_POOL_*
+        variables (see pool.py)"""
+        path = getenv('HBNB_SQLITE_DB') or "hbnb.db"
+        engine = create_engine('sqlite:///' + path,
+                               connect_args={"check_same_thread": False},
+                               **pool.options())
+        event.listen(engine, "connect", self.__configure)
+        super().__init__(engine)
+
+    @staticmethod
+    def __configure(connection, record):
+        """sets up each new connection to the database"""
+        cursor = connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        # a commit is durable at the next checkpoint, a crash can only
+        # lose the last transactions, never corrupt the database
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
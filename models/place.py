@@ -7,6 +7,21 @@ import sqlalchemy
 from sqlalchemy import Column, String, Integer, Float, ForeignKey, Table
 from sqlalchemy.orm import relationship
 
+
+def _id_set(value):
+    """returns value, an id or a collection of ids, as a set of ids,
+    leaving out the entries that can't be hashed and so can't be ids"""
+    if type(value) not in (list, tuple, set, frozenset):
+        value = () if value is None else (value,)
+    ids = set()
+    for item in value:
+        try:
+            ids.add(item)
+        except TypeError:
+            pass
+    return ids
+
+
 if models.storage_t == 'db':
     place_amenity = Table('place_amenity', Base.metadata,
                           Column('place_id', String(60),
@@ -16,15 +31,17 @@ if models.storage_t == 'db':
                           Column('amenity_id', String(60),
                                  ForeignKey('amenities.id', onupdate='CASCADE',
                                             ondelete='CASCADE'),
-                                 primary_key=True))
+                                 primary_key=True, index=True))
 
 
 class Place(BaseModel, Base):
     """Representation of Place """
     if models.storage_t == 'db':
         __tablename__ = 'places'
-        city_id = Column(String(60), ForeignKey('cities.id'), nullable=False)
-        user_id = Column(String(60), ForeignKey('users.id'), nullable=False)
+        city_id = Column(String(60), ForeignKey('cities.id'),
+                         nullable=False, index=True)
+        user_id = Column(String(60), ForeignKey('users.id'),
+                         nullable=False, index=True)
         name = Column(String(128), nullable=False)
         description = Column(String(1024), nullable=True)
         number_rooms = Column(Integer, nullable=False, default=0)
@@ -48,31 +65,37 @@ class Place(BaseModel, Base):
         price_by_night = 0
         latitude = 0.0
         longitude = 0.0
-        amenity_ids = []
+        amenity_ids = set()
 
     def __init__(self, *args, **kwargs):
         """initializes Place"""
         super().__init__(*args, **kwargs)
+        if models.storage_t != 'db':
+            self.amenity_ids = set(self.amenity_ids)
 
     if models.storage_t != 'db':
+        def __setattr__(self, name, value):
+            """sets an attribute, keeping amenity_ids a set of ids"""
+            if name == "amenity_ids":
+                value = _id_set(value)
+            super().__setattr__(name, value)
+
+        def to_dict(self, save_to_disk=False):
+            """returns a dictionary containing all keys/values of the
+            instance, with amenity_ids as a sorted list"""
+            new_dict = super().to_dict(save_to_disk)
+            new_dict["amenity_ids"] = sorted(new_dict["amenity_ids"],
+                                             key=str)
+            return new_dict
+
         @property
         def reviews(self):
             """getter attribute returns the list of Review instances"""
             from models.review import Review
-            review_list = []
-            all_reviews = models.storage.all(Review)
-            for review in all_reviews.values():
-                if review.place_id == self.id:
-                    review_list.append(review)
-            return review_list
+            return models.storage.filter(Review, place_id=self.id)
 
         @property
         def amenities(self):
             """getter attribute returns the list of Amenity instances"""
             from models.amenity import Amenity
-            amenity_list = []
-            all_amenities = models.storage.all(Amenity)
-            for amenity in all_amenities.values():
-                if amenity.place_id == self.id:
-                    amenity_list.append(amenity)
-            return amenity_list
+            return models.storage.get_many(Amenity, self.amenity_ids)
@@ -29,6 +29,19 @@ class User(BaseModel, Base):
         """initializes user"""
         super().__init__(*args, **kwargs)
 
+    if models.storage_t != 'db':
+        @property
+        def places(self):
+            """getter for list of place instances owned by the user"""
+            from models.place import Place
+            return models.storage.filter(Place, user_id=self.id)
+
+        @property
+        def reviews(self):
+            """getter for list of review instances written by the user"""
+            from models.review import Review
+            return models.storage.filter(Review, user_id=self.id)
+
     def __setattr__(self, name, value):
         """sets a password with md5 encryption"""
         if name == "password":
@@ -0,0 +1,100 @@
+#!/usr/bin/python3
+"""
+Contains the TestCitiesDocs and TestCities classes
+"""
+
+from api.v1.app import app
+from api.v1.views import cities
+import inspect
+import models
+from models.city import City
+from models.state import State
+import pep8
+import unittest
+
+
+class TestCitiesDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the view"""
+    def test_pep8_conformance_cities(self):
+        """Test that api/v1/views/cities.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/cities.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_cities(self):
+        """Test that tests/test_api/test_v1/test_views/test_cities.py
+        conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_views/'
+                                    'test_cities.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_cities_module_docstring(self):
+        """Test for the cities.py module docstring"""
+        self.assertIsNot(cities.__doc__, None,
+                         "cities.py needs a docstring")
+        self.assertTrue(len(cities.__doc__) >= 1,
+                        "cities.py needs a docstring")
+
+    def test_cities_func_docstrings(self):
+        """Test for the presence of docstrings in the view functions"""
+        for name, func in inspect.getmembers(cities, inspect.isfunction):
+            if func.__module__ != cities.__name__:
+                continue
+            self.assertIsNot(func.__doc__, None,
+                             "{:s} needs a docstring".format(name))
+            self.assertTrue(len(func.__doc__) >= 1,
+                            "{:s} needs a docstring".format(name))
+
+
+class TestCities(unittest.TestCase):
+    """Test the list of the cities of a state through the API"""
+    def test_page_of_cities(self):
+        """Test a page of cities is followed to the next by its cursor"""
+        state = State(name="Paged")
+        models.storage.new(state)
+        for i in range(5):
+            models.storage.new(City(name=str(i), state_id=state.id))
+        models.storage.save()
+        client = app.test_client()
+        url = "/api/v1/states/{}/cities?limit=3".format(state.id)
+        resp = client.get(url)
+        self.assertEqual(len(resp.get_json()), 3)
+        resp = client.get(url, headers={"Origin": "0.0.0.0"})
+        self.assertIn("X-Next-Cursor",
+                      resp.headers["Access-Control-Expose-Headers"])
+        resp = client.get(url + "&after=" + resp.headers["X-Next-Cursor"])
+        self.assertEqual(len(resp.get_json()), 2)
+        self.assertNotIn("X-Next-Cursor", resp.headers)
+        resp = client.get(url.replace("limit=3", "limit=0"))
+        self.assertEqual(resp.status_code, 400)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_page_of_cities_query(self):
+        """Test a page of cities is read alone with a LIMIT, instead of
+        loading every city of the state along with it"""
+        from sqlalchemy import event
+        state = State(name="Paged")
+        models.storage.new(state)
+        for i in range(5):
+            models.storage.new(City(name=str(i), state_id=state.id))
+        models.storage.save()
+        models.storage.close()
+        engine = models.storage._DBStorage__engine
+        statements = []
+
+        def count(*args):
+            """records the statements run"""
+            statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            resp = app.test_client().get(
+                "/api/v1/states/{}/cities?limit=2".format(state.id))
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        self.assertEqual(len(resp.get_json()), 2)
+        self.assertEqual(len(statements), 2)
+        self.assertNotIn("JOIN", " ".join(statements))
+        self.assertIn("LIMIT", statements[1])
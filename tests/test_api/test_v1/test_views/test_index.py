@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+"""
+Contains the TestIndexDocs and TestIndex classes
+"""
+
+from api.v1.app import app
+from api.v1.views import index
+import inspect
+import models
+import os
+import pep8
+import unittest
+from unittest import mock
+
+
+class TestIndexDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the view"""
+    def test_pep8_conformance_index(self):
+        """Test that api/v1/views/index.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/index.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_index(self):
+        """Test that tests/test_api/test_v1/test_views/test_index.py
+        conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_views/'
+                                    'test_index.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_index_module_docstring(self):
+        """Test for the index.py module docstring"""
+        self.assertIsNot(index.__doc__, None,
+                         "index.py needs a docstring")
+        self.assertTrue(len(index.__doc__) >= 1,
+                        "index.py needs a docstring")
+
+    def test_index_func_docstrings(self):
+        """Test for the presence of docstrings in the view functions"""
+        for name, func in inspect.getmembers(index, inspect.isfunction):
+            if func.__module__ != index.__name__:
+                continue
+            self.assertIsNot(func.__doc__, None,
+                             "{:s} needs a docstring".format(name))
+            self.assertTrue(len(func.__doc__) >= 1,
+                            "{:s} needs a docstring".format(name))
+
+
+class TestIndex(unittest.TestCase):
+    """Test the status, stats and metrics endpoints"""
+    def test_status(self):
+        """Test status answers OK"""
+        resp = app.test_client().get("/api/v1/status")
+        self.assertEqual(resp.get_json(), {"status": "OK"})
+
+    def test_metrics_off(self):
+        """Test metrics is not served unless turned on, even locally"""
+        with mock.patch.dict(os.environ):
+            os.environ.pop("HBNB_API_METRICS", None)
+            resp = app.test_client().get("/api/v1/metrics")
+        self.assertEqual(resp.status_code, 404)
+
+    def test_metrics_on(self):
+        """Test metrics serves the statistics of storage when turned on"""
+        with mock.patch.dict(os.environ, {"HBNB_API_METRICS": "1"}):
+            resp = app.test_client().get(
+                "/api/v1/metrics", environ_base={"REMOTE_ADDR": "10.0.0.1"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.get_json().keys(),
+                         models.storage.metrics().keys())
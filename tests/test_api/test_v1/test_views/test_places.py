@@ -0,0 +1,65 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlacesDocs and TestPlaces classes
+"""
+
+from api.v1.app import app
+from api.v1.views import places
+import inspect
+import pep8
+import unittest
+
+
+class TestPlacesDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the view"""
+    def test_pep8_conformance_places(self):
+        """Test that api/v1/views/places.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/places.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_places(self):
+        """Test that tests/test_api/test_v1/test_views/
+        test_places.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_views/'
+                                    'test_places.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_places_module_docstring(self):
+        """Test for the places.py module docstring"""
+        self.assertIsNot(places.__doc__, None,
+                         "places.py needs a docstring")
+        self.assertTrue(len(places.__doc__) >= 1,
+                        "places.py needs a docstring")
+
+    def test_places_func_docstrings(self):
+        """Test for the presence of docstrings in the view functions"""
+        for name, func in inspect.getmembers(places,
+                                             inspect.isfunction):
+            if func.__module__ != places.__name__:
+                continue
+            self.assertIsNot(func.__doc__, None,
+                             "{:s} needs a docstring".format(name))
+            self.assertTrue(len(func.__doc__) >= 1,
+                            "{:s} needs a docstring".format(name))
+
+
+class TestPlacesSearch(unittest.TestCase):
+    """Test the search of places through the API"""
+    def test_search_invalid_ids(self):
+        """Test ids that are not lists of strings are refused"""
+        client = app.test_client()
+        for body in ({"amenities": [["x"]]}, {"states": "x"},
+                     {"cities": [1]}, [1]):
+            resp = client.post("/api/v1/places_search", json=body)
+            self.assertEqual(resp.status_code, 400, body)
+
+    def test_search_unknown_ids(self):
+        """Test ids of nothing give an empty list"""
+        resp = app.test_client().post("/api/v1/places_search",
+                                      json={"amenities": ["x"]})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.get_json(), [])
@@ -0,0 +1,109 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlacesAmenitiesDocs and TestPlacesAmenities classes
+"""
+
+from api.v1.app import app
+from api.v1.views import places_amenities
+import inspect
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+import pep8
+import unittest
+
+
+class TestPlacesAmenitiesDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the view"""
+    def test_pep8_conformance_places_amenities(self):
+        """Test that api/v1/views/places_amenities.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/places_amenities.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_places_amenities(self):
+        """Test that tests/test_api/test_v1/test_views/
+        test_places_amenities.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_views/'
+                                    'test_places_amenities.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_places_amenities_module_docstring(self):
+        """Test for the places_amenities.py module docstring"""
+        self.assertIsNot(places_amenities.__doc__, None,
+                         "places_amenities.py needs a docstring")
+        self.assertTrue(len(places_amenities.__doc__) >= 1,
+                        "places_amenities.py needs a docstring")
+
+    def test_places_amenities_func_docstrings(self):
+        """Test for the presence of docstrings in the view functions"""
+        for name, func in inspect.getmembers(places_amenities,
+                                             inspect.isfunction):
+            if func.__module__ != places_amenities.__name__:
+                continue
+            self.assertIsNot(func.__doc__, None,
+                             "{:s} needs a docstring".format(name))
+            self.assertTrue(len(func.__doc__) >= 1,
+                            "{:s} needs a docstring".format(name))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing File Storage")
+class TestPlacesAmenities(unittest.TestCase):
+    """Test the links between places and amenities through the API"""
+    def setUp(self):
+        """creates a place and an amenity to link"""
+        self.client = app.test_client()
+        self.state = State(name="California")
+        self.city = City(name="San Francisco", state_id=self.state.id)
+        self.user = User(email="a@b.c", password="pwd")
+        self.place = Place(name="Loft", city_id=self.city.id,
+                           user_id=self.user.id)
+        self.amenity = Amenity(name="Wifi")
+        self.objs = [self.state, self.city, self.user, self.place,
+                     self.amenity]
+        for obj in self.objs:
+            models.storage.new(obj)
+        models.storage.save()
+
+    def tearDown(self):
+        """deletes the objects made by the test"""
+        for obj in self.objs:
+            models.storage.delete(obj)
+        models.storage.save()
+
+    def test_link_after_put(self):
+        """Test a place updated with a list of amenity_ids can be linked"""
+        url = "/api/v1/places/{}".format(self.place.id)
+        resp = self.client.put(url, json={"amenity_ids": []})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.get_json()["amenity_ids"], [])
+        self.assertEqual(self.place.amenity_ids, set())
+        url = "/api/v1/places/{}/amenities/{}".format(self.place.id,
+                                                      self.amenity.id)
+        resp = self.client.post(url)
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(self.place.amenity_ids, {self.amenity.id})
+        resp = self.client.post(url)
+        self.assertEqual(resp.status_code, 200)
+        resp = self.client.delete(url)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(self.place.amenity_ids, set())
+        resp = self.client.delete(url)
+        self.assertEqual(resp.status_code, 404)
+
+    def test_create_unhashable_amenity_ids(self):
+        """Test a place can be created with amenity_ids that aren't ids"""
+        url = "/api/v1/cities/{}/places".format(self.city.id)
+        resp = self.client.post(url, json={"user_id": self.user.id,
+                                           "name": "Room",
+                                           "amenity_ids": [["a"], "b"]})
+        self.assertEqual(resp.status_code, 201)
+        place = models.storage.get(Place, resp.get_json()["id"])
+        self.objs.append(place)
+        self.assertEqual(place.amenity_ids, {"b"})
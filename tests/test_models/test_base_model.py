@@ -97,6 +97,14 @@ class TestBaseModel(unittest.TestCase):
         self.assertNotEqual(inst1.created_at, inst2.created_at)
         self.assertNotEqual(inst1.updated_at, inst2.updated_at)
 
+    def test_datetime_kwargs(self):
+        """Test that datetime values given as kwargs are kept"""
+        created_at = datetime(2017, 6, 14, 22, 31, 3, 285259)
+        updated_at = datetime(2017, 6, 15, 1, 2, 3)
+        inst = BaseModel(id="1", created_at=created_at, updated_at=updated_at)
+        self.assertEqual(inst.created_at, created_at)
+        self.assertEqual(inst.updated_at, updated_at)
+
     def test_uuid(self):
         """Test that id is a valid uuid"""
         inst1 = BaseModel()
@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+"""
+Contains the TestCompressionDocs and TestCompression classes
+"""
+
+import inspect
+from models.engine import compression
+import os
+import pep8
+import unittest
+
+
+class TestCompressionDocs(unittest.TestCase):
+    """Tests to check the documentation and style of compression"""
+    def test_pep8_conformance_compression(self):
+        """Test that models/engine/compression.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/compression.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_compression(self):
+        """Test tests/test_models/test_compression.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_compression.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_compression_module_docstring(self):
+        """Test for the compression.py module docstring"""
+        self.assertIsNot(compression.__doc__, None,
+                         "compression.py needs a docstring")
+        self.assertTrue(len(compression.__doc__) >= 1,
+                        "compression.py needs a docstring")
+
+    def test_compression_func_docstrings(self):
+        """Test for the presence of docstrings in compression functions"""
+        for func in inspect.getmembers(compression, inspect.isfunction):
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} function needs a docstring".format(func[0]))
+
+
+class TestCompression(unittest.TestCase):
+    """Test the compression codecs"""
+    data = b'{"State.1": {"name": "California"}}' * 100
+
+    def tearDown(self):
+        """Remove the file written by the tests"""
+        if os.path.exists("test.bin"):
+            os.remove("test.bin")
+
+    def write(self, codec):
+        """writes data to test.bin with codec"""
+        with open("test.bin", "wb") as f:
+            with compression.writer(f, codec) as out:
+                out.write(self.data)
+            self.assertFalse(f.closed)
+
+    def test_round_trip(self):
+        """Test that every codec reads back what it wrote"""
+        for codec in ["none"] + list(compression.codecs) + ["gzip:1"]:
+            with self.subTest(codec=codec):
+                self.write(codec)
+                name = codec.split(":")[0]
+                self.assertEqual(compression.detect("test.bin"), name)
+                if name != "none":
+                    self.assertLess(os.path.getsize("test.bin"),
+                                    len(self.data))
+                with compression.open_read("test.bin") as f:
+                    self.assertEqual(f.read(), self.data)
+
+    def test_codec_for(self):
+        """Test that the extension of a path names its codec"""
+        self.assertEqual(compression.codec_for("file.json"), "none")
+        self.assertEqual(compression.codec_for("file.json.gz"), "gzip")
+        self.assertEqual(compression.codec_for("file.json.xz"), "xz")
+
+    def test_unknown_codec(self):
+        """Test that an unknown codec is refused"""
+        with open("test.bin", "wb") as f:
+            with self.assertRaises(ValueError):
+                compression.writer(f, "zip")
@@ -114,6 +114,125 @@ class TestFileStorage(unittest.TestCase):
         c = models.storage.count()
         self.assertEqual(len(models.storage.all()), c)
 
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_get_by_primary_key(self):
+        """Test that get finds a row by id and returns None otherwise"""
+        state = State(name="California")
+        state.save()
+        self.assertIs(models.storage.get(State, state.id), state)
+        self.assertIsNone(models.storage.get(State, "missing"))
+        self.assertIn(state, list(models.storage.stream(State, 1)))
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_filter(self):
+        """Test that filter and find_one select rows by their conditions"""
+        state = State(name="Filtered")
+        state.save()
+        city = City(name="Filtered", state_id=state.id)
+        city.save()
+        self.assertEqual(models.storage.filter(City, state_id=state.id),
+                         [city])
+        self.assertEqual(models.storage.filter("City", name="Filtered",
+                                               id__in=[city.id, "x"]),
+                         [city])
+        self.assertIn(city, models.storage.filter(
+            City, created_at__ge=city.created_at))
+        self.assertIs(models.storage.find_one(State, id=state.id), state)
+        self.assertIsNone(models.storage.find_one(State, id="missing"))
+        with self.assertRaises(ValueError):
+            models.storage.filter(City, nope="x")
+        with self.assertRaises(ValueError):
+            models.storage.find_one(State, cities__in=[])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_filter_paginated(self):
+        """Test that filter with limit and after pages the rows found by
+        (created_at, id)"""
+        state = State(name="Paged")
+        models.storage.new(state)
+        cities = [City(name=str(i), state_id=state.id) for i in range(5)]
+        for city in cities:
+            models.storage.new(city)
+        models.storage.save()
+        cities.sort(key=lambda city: (city.created_at, city.id))
+        page = models.storage.filter(City, 2, state_id=state.id)
+        self.assertEqual(page, cities[:2])
+        after = (page[-1].created_at, page[-1].id)
+        self.assertEqual(models.storage.filter(City, 2, after,
+                                               state_id=state.id),
+                         cities[2:4])
+        self.assertEqual(models.storage.filter(City, after=after,
+                                               state_id=state.id),
+                         cities[2:])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_get_many(self):
+        """Test that get_many returns the rows found, in the order asked"""
+        states = [State(name=str(i)) for i in range(3)]
+        for state in states:
+            models.storage.new(state)
+        models.storage.save()
+        ids = [states[2].id, "missing", states[0].id, states[2].id]
+        self.assertEqual(models.storage.get_many(State, ids),
+                         [states[2], states[0]])
+        self.assertEqual(models.storage.get_many(City, ids), [])
+        self.assertEqual(models.storage.get_many(State, []), [])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_eager(self):
+        """Test that eager loads relationships in a fixed number of queries
+        whatever the number of parents"""
+        from sqlalchemy import event
+        for i in range(3):
+            state = State(name="Eager")
+            models.storage.new(state)
+            for j in range(2):
+                models.storage.new(City(name="Eager", state_id=state.id))
+        models.storage.save()
+        engine = models.storage._DBStorage__engine
+        for strategy, queries in (("joined", 1), ("selectin", 2)):
+            models.storage.close()
+            statements = []
+
+            def count(*args):
+                """counts the statements run"""
+                statements.append(args[2])
+            event.listen(engine, "before_cursor_execute", count)
+            try:
+                states = models.storage.all(State, eager={
+                    "cities": strategy}).values()
+                cities = [city for state in states for city in state.cities]
+            finally:
+                event.remove(engine, "before_cursor_execute", count)
+            self.assertEqual(len(statements), queries)
+            self.assertGreaterEqual(len(cities), 6)
+        models.storage.close()
+        state = models.storage.get(State, state.id,
+                                   eager={"cities.places": "selectin"})
+        self.assertEqual(len(state.cities), 2)
+        with self.assertRaises(ValueError):
+            models.storage.all(State, eager={"cities": "lazy"})
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_pool_metrics(self):
+        """Test that metrics reports the connections of the pool"""
+        models.storage.close()
+        models.storage.count(State)
+        stats = models.storage.metrics()["pool"]
+        self.assertEqual(stats["checked_out"], 1)
+        self.assertGreaterEqual(stats["checkouts"], 1)
+        self.assertGreaterEqual(stats["max_wait_seconds"], 0)
+        models.storage.close()
+        self.assertEqual(models.storage.metrics()["pool"]["checked_out"], 0)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_counts(self):
+        """Test that counts gives the count of every table at once"""
+        counts = models.storage.counts()
+        self.assertEqual(set(counts), set(classes))
+        for key, value in classes.items():
+            self.assertEqual(counts[key], models.storage.count(value))
+
 
 if __name__ == '__main__':
     unittest.main()
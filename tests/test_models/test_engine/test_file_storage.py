@@ -5,8 +5,9 @@ Contains the TestFileStorageDocs classes
 
 from datetime import datetime
 import inspect
+import io
 import models
-from models.engine import file_storage
+from models.engine import file_storage, locks
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
@@ -15,9 +16,15 @@ from models.review import Review
 from models.state import State
 from models.user import User
 import json
+import multiprocessing
 import os
 import pep8
+import subprocess
+import sys
+import threading
+import time
 import unittest
+from unittest import mock
 FileStorage = file_storage.FileStorage
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
@@ -126,6 +133,730 @@ class TestFileStorage(unittest.TestCase):
         get_instance = storage.get(State, instance.id)
         self.assertEqual(get_instance, instance)
 
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_get_many(self):
+        """Test that get_many returns the objects found, in order"""
+        storage = FileStorage()
+        amenities = [Amenity(name=str(i)) for i in range(3)]
+        for amenity in amenities:
+            storage.new(amenity)
+        ids = [amenities[2].id, "missing", amenities[0].id, amenities[2].id]
+        self.assertEqual(storage.get_many(Amenity, ids),
+                         [amenities[2], amenities[0]])
+        self.assertEqual(storage.get_many("Amenity", [amenities[1].id]),
+                         [amenities[1]])
+        self.assertEqual(storage.get_many(State, ids), [])
+        place = Place(amenity_ids=[amenities[1].id, "missing"])
+        self.assertEqual(place.amenities, [amenities[1]])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_cls(self):
+        """Test that all(cls) only returns objects of that class"""
+        storage = FileStorage()
+        state = State(name="FT43")
+        city = City(name="Texas")
+        storage.new(state)
+        storage.new(city)
+        states = storage.all(State)
+        self.assertIn("State." + state.id, states)
+        self.assertNotIn("City." + city.id, states)
+        self.assertEqual(states, storage.all("State"))
+        for value in states.values():
+            self.assertIs(type(value), State)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_get_after_delete(self):
+        """Test that get no longer finds a deleted object"""
+        storage = FileStorage()
+        state = State(name="FT43")
+        storage.new(state)
+        self.assertIs(storage.get(State, state.id), state)
+        storage.delete(state)
+        self.assertIsNone(storage.get(State, state.id))
+        self.assertIsNone(storage.get(City, state.id))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close_reloads_only_changes(self):
+        """Test that close keeps objects until file.json changes"""
+        storage = FileStorage()
+        state = State(name="FT43")
+        storage.new(state)
+        storage.compact()
+        storage.close()
+        self.assertIs(storage.get(State, state.id), state)
+        with open("file.json", "r") as f:
+            js = json.load(f)
+        js["State." + state.id]["name"] = "California"
+        js["State." + state.id]["updated_at"] = "2030-01-01T00:00:00.000000"
+        with open("file.json", "w") as f:
+            json.dump(js, f)
+        storage.close()
+        new_state = storage.get(State, state.id)
+        self.assertIsNot(new_state, state)
+        self.assertEqual(new_state.name, "California")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close_unreadable_file(self):
+        """Test that close leaves every object as it was when file.json
+        holds a record that cannot be read"""
+        storage = FileStorage()
+        state = State(name="FT43")
+        storage.new(state)
+        storage.compact()
+        with open("file.json", "r") as f:
+            js = json.load(f)
+        js["State." + state.id]["name"] = "California"
+        js["State." + state.id]["updated_at"] = "2030-01-01T00:00:00.000000"
+        js["Nope.1"] = {"__class__": "Nope", "id": "1"}
+        with open("file.json", "w") as f:
+            json.dump(js, f)
+        with mock.patch("sys.stderr", new=io.StringIO()) as err:
+            storage.close()
+        self.assertIn("KeyError", err.getvalue())
+        self.assertIs(storage.get(State, state.id), state)
+        self.assertEqual(state.name, "FT43")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_journal(self):
+        """Test that journal mode appends changes and reload replays them"""
+        storage = FileStorage()
+        storage.compact()
+        journal = FileStorage._FileStorage__journal
+        FileStorage._FileStorage__journal = True
+        try:
+            with open("file.json", "r") as f:
+                js = f.read()
+            state = State(name="FT43")
+            state.save()
+            city = City(name="Texas", state_id=state.id)
+            city.save()
+            storage.delete(city)
+            storage.save()
+            with open("file.json", "r") as f:
+                self.assertEqual(js, f.read())
+            with open("file.json.log", "r") as f:
+                self.assertEqual(len(f.readlines()), 3)
+            save = FileStorage._FileStorage__objects
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            self.assertEqual(storage.get(State, state.id).name, "FT43")
+            self.assertIsNone(storage.get(City, city.id))
+            FileStorage._FileStorage__objects = save
+            storage.compact()
+            self.assertFalse(os.path.exists("file.json.log"))
+        finally:
+            FileStorage._FileStorage__journal = journal
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_journal_torn_line(self):
+        """Test that the changes saved after a journal line cut short by a
+        crash are kept"""
+        storage = FileStorage()
+        storage.compact()
+        journal = FileStorage._FileStorage__journal
+        FileStorage._FileStorage__journal = True
+        objects = FileStorage._FileStorage__objects
+        try:
+            states = [State(name="FT43"), State(name="Texas")]
+            for state in states:
+                state.save()
+            with open("file.json.log", "a") as f:
+                f.write('{"State.torn": {"__cla')
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            after = State(name="after-restart")
+            after.save()
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            for state in states + [after]:
+                self.assertEqual(storage.get(State, state.id).name,
+                                 state.name)
+        finally:
+            FileStorage._FileStorage__journal = journal
+            FileStorage._FileStorage__objects = objects
+            storage.compact()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_reencodes_dirty_objects(self):
+        """Test that save only encodes objects changed since the last save"""
+        storage = FileStorage()
+        state = State(name="FT43")
+        state.save()
+        state.__dict__["name"] = "Not marked dirty"
+        storage.save()
+        with open("file.json", "r") as f:
+            js = json.load(f)
+        self.assertEqual(js["State." + state.id]["name"], "FT43")
+        state.name = "California"
+        storage.save()
+        with open("file.json", "r") as f:
+            js = json.load(f)
+        self.assertEqual(js["State." + state.id]["name"], "California")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_children(self):
+        """Test that children follows new, foreign key changes and delete"""
+        storage = FileStorage()
+        state1 = State(name="FT43")
+        state2 = State(name="Texas")
+        city = City(name="Austin", state_id=state1.id)
+        for obj in (state1, state2, city):
+            storage.new(obj)
+        self.assertEqual(storage.children(City, "state_id", state1.id),
+                         [city])
+        self.assertEqual(state1.cities, [city])
+        city.state_id = state2.id
+        self.assertEqual(state1.cities, [])
+        self.assertEqual(state2.cities, [city])
+        storage.delete(city)
+        self.assertEqual(state2.cities, [])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_filter(self):
+        """Test that filter and find_one answer equality, in and ranges,
+        from the indexes as they change"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        hashed = file_storage.hash_indexes["Place"]
+        ordered = file_storage.sorted_indexes["Place"]
+        FileStorage._FileStorage__objects = {}
+        file_storage.hash_indexes["Place"] = hashed + ("name",)
+        file_storage.sorted_indexes["Place"] = ordered + ("price_by_night",)
+        try:
+            places = [Place(name="P{}".format(i % 2), city_id=str(i % 3),
+                            price_by_night=10 * i) for i in range(6)]
+            for place in places:
+                storage.new(place)
+            self.assertCountEqual(storage.filter(Place, city_id="0"),
+                                  [places[0], places[3]])
+            self.assertCountEqual(storage.filter("Place", name="P1",
+                                                 city_id__in=["0", "1"]),
+                                  [places[1], places[3]])
+            self.assertEqual(storage.filter(Place, id__in=[places[2].id,
+                                                           "missing"]),
+                             [places[2]])
+            self.assertCountEqual(storage.filter(Place,
+                                                 price_by_night__ge=20,
+                                                 price_by_night__lt=40),
+                                  places[2:4])
+            self.assertIn(("Place", "price_by_night"),
+                          FileStorage._FileStorage__sorted)
+            self.assertEqual(storage.filter(Place, price_by_night__le=0),
+                             [places[0]])
+            places[0].price_by_night = 100
+            places[1].name = "P0"
+            storage.delete(places[4])
+            self.assertEqual(storage.filter(Place, price_by_night__gt=40),
+                             [places[5], places[0]])
+            self.assertCountEqual(storage.filter(Place, name="P0"),
+                                  [places[0], places[1], places[2]])
+            self.assertEqual(storage.filter(Place, description="none"), [])
+            self.assertIs(storage.find_one(Place, price_by_night=30),
+                          places[3])
+            self.assertIsNone(storage.find_one(Place, city_id="3"))
+            self.assertEqual(storage.filter("Nope", id="1"), [])
+            with self.assertRaises(ValueError):
+                storage.filter(Place, price_by_night__ne=0)
+            with self.assertRaises(ValueError):
+                storage.filter(Place, nope="x")
+            with self.assertRaises(ValueError):
+                storage.find_one(Place, reviews__in=[])
+        finally:
+            file_storage.hash_indexes["Place"] = hashed
+            file_storage.sorted_indexes["Place"] = ordered
+            FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_stream(self):
+        """Test that stream yields the same objects as all"""
+        storage = FileStorage()
+        storage.new(State(name="FT43"))
+        self.assertCountEqual(list(storage.stream(State)),
+                              list(storage.all(State).values()))
+        self.assertCountEqual(list(storage.stream()),
+                              list(storage.all().values()))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_search_places(self):
+        """Test that search_places filters by states, cities and amenities"""
+        storage = FileStorage()
+        state = State(name="FT43")
+        city1 = City(name="Austin", state_id=state.id)
+        city2 = City(name="Dallas", state_id="other")
+        amenity = Amenity(name="Wifi")
+        place1 = Place(name="Loft", city_id=city1.id)
+        place2 = Place(name="Barn", city_id=city2.id)
+        place2.amenity_ids = [amenity.id]
+        for obj in (state, city1, city2, amenity, place1, place2):
+            storage.new(obj)
+        self.assertEqual(storage.search_places([state.id]), [place1])
+        self.assertCountEqual(storage.search_places([state.id], [city2.id]),
+                              [place1, place2])
+        self.assertEqual(storage.search_places([state.id], [city2.id],
+                                               [amenity.id]), [place2])
+        self.assertEqual(storage.search_places([state.id], [],
+                                               [amenity.id]), [])
+        place1.amenity_ids = place1.amenity_ids | {amenity.id}
+        self.assertCountEqual(storage.search_places([], [], [amenity.id]),
+                              [place1, place2])
+        self.assertCountEqual(storage.children(Place, "amenity_ids",
+                                               amenity.id), [place1, place2])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_paginated(self):
+        """Test that all with limit and after pages by (created_at, id)"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        try:
+            amenities = [Amenity(name=str(i)) for i in range(4)]
+            for amenity in amenities:
+                storage.new(amenity)
+            amenities.sort(key=lambda amenity: (amenity.created_at,
+                                                amenity.id))
+            page = list(storage.all(Amenity, limit=2).values())
+            self.assertEqual(page, amenities[:2])
+            after = (page[-1].created_at, page[-1].id)
+            last = Amenity(name="4")
+            storage.new(last)
+            storage.delete(amenities[2])
+            page = list(storage.all(Amenity, limit=2, after=after).values())
+            self.assertEqual(page, [amenities[3], last])
+        finally:
+            FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_filter_paginated(self):
+        """Test that filter and search_places with limit and after page
+        the objects found by (created_at, id)"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        try:
+            places = [Place(name=str(i), city_id="AB"[i % 10 != 0])
+                      for i in range(20)]
+            for place in places:
+                storage.new(place)
+            places.sort(key=lambda place: (place.created_at, place.id))
+            for city_id, limit in (("A", 1), ("B", 2), ("B", 7)):
+                found = [place for place in places
+                         if place.city_id == city_id]
+                after = None
+                for start in range(0, len(found), limit):
+                    page = storage.filter(Place, limit, after,
+                                          city_id=city_id)
+                    self.assertEqual(page, found[start:start + limit])
+                    self.assertEqual(storage.search_places(
+                        [], [city_id], limit=limit, after=after), page)
+                    after = (page[-1].created_at, page[-1].id)
+                self.assertEqual(storage.filter(Place, limit, after,
+                                                city_id=city_id), [])
+            after = (places[3].created_at, places[3].id)
+            self.assertEqual(storage.filter(Place, after=after, name__in=[
+                places[2].name, places[5].name]), [places[5]])
+            self.assertEqual(storage.search_places(limit=3, after=after),
+                             places[4:7])
+        finally:
+            FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_thread_safe(self):
+        """Test that threads can add objects while others iterate all"""
+        storage = FileStorage()
+        lock = FileStorage._FileStorage__lock
+        FileStorage._FileStorage__lock = locks.ReadWriteLock()
+        errors = []
+
+        def writer():
+            for i in range(200):
+                storage.new(State(name=str(i)))
+
+        def reader():
+            try:
+                for i in range(200):
+                    for obj in storage.all().values():
+                        pass
+            except RuntimeError as e:
+                errors.append(e)
+
+        try:
+            threads = [threading.Thread(target=writer),
+                       threading.Thread(target=reader)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertIsNot(storage.all(), storage.all())
+        finally:
+            FileStorage._FileStorage__lock = lock
+        self.assertEqual(errors, [])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_shared_merges_other_processes(self):
+        """Test that in shared mode save keeps what another process saved"""
+        storage = FileStorage()
+        shared = FileStorage._FileStorage__shared
+        FileStorage._FileStorage__shared = True
+        try:
+            storage.save()
+            script = ("from models.state import State\n"
+                      "state = State(name='Other')\n"
+                      "state.save()\n"
+                      "print(state.id)\n")
+            env = dict(os.environ, HBNB_FILE_SHARED="1")
+            other_id = subprocess.check_output([sys.executable, "-c", script],
+                                               env=env).decode().strip()
+            state = State(name="Mine")
+            state.save()
+            with open("file.json", "r") as f:
+                js = json.load(f)
+            self.assertIn("State." + state.id, js)
+            self.assertIn("State." + other_id, js)
+            self.assertEqual(storage.get(State, other_id).name, "Other")
+        finally:
+            FileStorage._FileStorage__shared = shared
+            if not shared:
+                os.remove("file.json.lock")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_atomic(self):
+        """Test that save replaces file.json without leaving a temp file"""
+        storage = FileStorage()
+        policy = FileStorage._FileStorage__fsync
+        FileStorage._FileStorage__fsync = None
+        try:
+            state = State(name="FT43")
+            state.save()
+        finally:
+            FileStorage._FileStorage__fsync = policy
+        with open("file.json", "r") as f:
+            self.assertIn("State." + state.id, json.load(f))
+        self.assertEqual([name for name in os.listdir(".")
+                          if name.endswith(".tmp")], [])
+
+        def failing():
+            yield "{"
+            raise OSError("disk full")
+        with self.assertRaises(OSError):
+            storage._FileStorage__write("file.json", failing())
+        self.assertEqual([name for name in os.listdir(".")
+                          if name.endswith(".tmp")], [])
+        with open("file.json", "r") as f:
+            self.assertIn("State." + state.id, json.load(f))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_fsync_policy(self):
+        """Test that every write is synced with its directory, at once or
+        within the interval of the policy"""
+        self.assertEqual(file_storage._fsync_policy("always"), 0)
+        self.assertIsNone(file_storage._fsync_policy("never"))
+        self.assertEqual(file_storage._fsync_policy("250"), 0.25)
+        with self.assertRaises(ValueError):
+            file_storage._fsync_policy("soon")
+        storage = FileStorage()
+        policy = FileStorage._FileStorage__fsync
+        synced = []
+        try:
+            with mock.patch.object(file_storage, "fsync"), \
+                    mock.patch.object(file_storage, "_fsync_path",
+                                      side_effect=synced.append):
+                FileStorage._FileStorage__fsync = 0
+                storage.compact()
+                self.assertIn(".", synced)
+                FileStorage._FileStorage__fsync = 0.05
+                FileStorage._FileStorage__synced_at = time.monotonic()
+                del synced[:]
+                storage.compact()
+                self.assertEqual(synced, [])
+                time.sleep(0.2)
+                self.assertIn(".", synced)
+                self.assertGreater(len(synced), 1)
+        finally:
+            FileStorage._FileStorage__fsync = policy
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_group_commit(self):
+        """Test that saves made during a write share the next write"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__save
+        writes = []
+
+        def slow_save(self):
+            writes.append(1)
+            time.sleep(0.1)
+            save(self)
+
+        FileStorage._FileStorage__save = slow_save
+        try:
+            threads = [threading.Thread(target=storage.save)
+                       for i in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            FileStorage._FileStorage__save = save
+        self.assertLessEqual(len(writes), 2)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_write_behind(self):
+        """Test that write-behind saves are written by flush or the flusher"""
+        storage = FileStorage()
+        storage.flush()
+        modes = (FileStorage._FileStorage__write_behind,
+                 FileStorage._FileStorage__flush_after,
+                 FileStorage._FileStorage__lock)
+        FileStorage._FileStorage__write_behind = 60
+        FileStorage._FileStorage__flush_after = 1000
+        try:
+            state = State(name="Delayed")
+            storage.new(state)
+            storage.save()
+            with open("file.json", "r") as f:
+                self.assertNotIn("State." + state.id, json.load(f))
+            storage.flush()
+            with open("file.json", "r") as f:
+                self.assertIn("State." + state.id, json.load(f))
+            FileStorage._FileStorage__flush_after = 1
+            state = State(name="Woken")
+            storage.new(state)
+            storage.save()
+            for i in range(50):
+                if not (FileStorage._FileStorage__unflushed or
+                        FileStorage._FileStorage__saving):
+                    break
+                time.sleep(0.05)
+            with open("file.json", "r") as f:
+                self.assertIn("State." + state.id, json.load(f))
+        finally:
+            self.stop_flusher(*modes)
+
+    def stop_flusher(self, write_behind, flush_after, lock):
+        """puts back the write-behind modes and lock, once the flusher
+        thread started by a test is done"""
+        FileStorage._FileStorage__write_behind = write_behind
+        FileStorage._FileStorage__flush_after = flush_after
+        flusher = FileStorage._FileStorage__flusher
+        if flusher is not None and not write_behind:
+            FileStorage._FileStorage__wake.set()
+            flusher.join()
+            FileStorage._FileStorage__lock = lock
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_write_behind_concurrent(self):
+        """Test that objects can be added and changed while the flusher
+        writes them"""
+        storage = FileStorage()
+        storage.flush()
+        modes = (FileStorage._FileStorage__write_behind,
+                 FileStorage._FileStorage__flush_after,
+                 FileStorage._FileStorage__lock)
+        FileStorage._FileStorage__write_behind = 0.001
+        FileStorage._FileStorage__flush_after = 1000
+        states = []
+        try:
+            with mock.patch.object(file_storage.traceback,
+                                   "print_exc") as print_exc:
+                for i in range(2000):
+                    state = State(name="Old")
+                    storage.new(state)
+                    storage.save()
+                    state.name = "New"
+                    states.append(state)
+                    storage.save()
+                storage.flush()
+            self.assertFalse(print_exc.called)
+            self.assertIsInstance(FileStorage._FileStorage__lock,
+                                  locks.ReadWriteLock)
+            with open("file.json", "r") as f:
+                js = json.load(f)
+            for state in states:
+                self.assertEqual(js["State." + state.id]["name"], "New")
+        finally:
+            self.stop_flusher(*modes)
+            for state in states:
+                storage.delete(state)
+            storage.flush()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_lazy(self):
+        """Test that lazy mode builds objects only when they are used"""
+        storage = FileStorage()
+        state = State(name="FT43")
+        state.save()
+        city = City(name="Texas", state_id=state.id)
+        city.save()
+        objects = FileStorage._FileStorage__objects
+        lazy = FileStorage._FileStorage__lazy
+        FileStorage._FileStorage__lazy = True
+        try:
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            self.assertEqual(FileStorage._FileStorage__objects, {})
+            self.assertEqual(storage.count(City),
+                             len([key for key in objects
+                                  if key.startswith("City.")]))
+            self.assertEqual([c.id for c in storage.children(
+                City, "state_id", state.id)], [city.id])
+            self.assertEqual(list(FileStorage._FileStorage__objects),
+                             ["City." + city.id])
+            self.assertEqual(storage.get(State, state.id).name, "FT43")
+            storage.compact()
+            with open("file.json", "r") as f:
+                self.assertEqual(set(json.load(f)), set(objects))
+            self.assertEqual(len(storage.all()), len(objects))
+            self.assertEqual(FileStorage._FileStorage__raw, {})
+        finally:
+            FileStorage._FileStorage__lazy = lazy
+            FileStorage._FileStorage__objects = objects
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    @unittest.skipIf("fork" not in multiprocessing.get_all_start_methods(),
+                     "cannot fork worker processes")
+    def test_parallel_reload(self):
+        """Test that worker processes build the same objects as reload"""
+        storage = FileStorage()
+        place = Place(name="Loft", amenity_ids=["a", "b"])
+        place.save()
+        State(name="FT43").save()
+        objects = FileStorage._FileStorage__objects
+        expected = {key: obj.to_dict() for key, obj in objects.items()}
+        workers = FileStorage._FileStorage__workers
+        try:
+            for count in (2, len(expected) + 3):
+                FileStorage._FileStorage__workers = count
+                self.assertIsNotNone(storage._FileStorage__read_parallel())
+                FileStorage._FileStorage__objects = {}
+                storage.reload()
+                self.assertEqual({key: obj.to_dict() for key, obj in
+                                  storage.all().items()}, expected)
+                self.assertEqual(storage.get(Place, place.id).amenity_ids,
+                                 {"a", "b"})
+            with open("file.json", "w") as f:
+                json.dump({key: expected[key] for key in expected}, f)
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            self.assertEqual(set(storage.all()), set(expected))
+        finally:
+            FileStorage._FileStorage__workers = workers
+            FileStorage._FileStorage__objects = objects
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_binary_format(self):
+        """Test that compact can write a binary snapshot that reload reads"""
+        storage = FileStorage()
+        place = Place(name="Loft", amenity_ids=["a", "b"])
+        place.save()
+        objects = FileStorage._FileStorage__objects
+        expected = {key: obj.to_dict() for key, obj in objects.items()}
+        file_format = FileStorage._FileStorage__format
+        FileStorage._FileStorage__format = "binary"
+        try:
+            storage.compact()
+            self.assertTrue(file_storage.snapshot.is_snapshot("file.json"))
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            self.assertEqual({key: obj.to_dict() for key, obj in
+                              storage.all().items()}, expected)
+            self.assertEqual(storage.get(Place, place.id).amenity_ids,
+                             {"a", "b"})
+        finally:
+            FileStorage._FileStorage__format = file_format
+            FileStorage._FileStorage__objects = objects
+            os.remove("file.json")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_compressed(self):
+        """Test that compact can compress the file, and reload read it"""
+        storage = FileStorage()
+        State(name="FT43").save()
+        objects = FileStorage._FileStorage__objects
+        expected = {key: obj.to_dict() for key, obj in objects.items()}
+        modes = (FileStorage._FileStorage__compress,
+                 FileStorage._FileStorage__format)
+        for file_format in ("json", "binary"):
+            FileStorage._FileStorage__compress = "gzip"
+            FileStorage._FileStorage__format = file_format
+            try:
+                storage.compact()
+                with open("file.json", "rb") as f:
+                    self.assertEqual(f.read(2), b"\x1f\x8b")
+                FileStorage._FileStorage__objects = {}
+                storage.reload()
+                self.assertEqual({key: obj.to_dict() for key, obj in
+                                  storage.all().items()}, expected)
+            finally:
+                (FileStorage._FileStorage__compress,
+                 FileStorage._FileStorage__format) = modes
+                FileStorage._FileStorage__objects = objects
+                os.remove("file.json")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_sharded(self):
+        """Test that sharded mode reads a class on first use and rewrites
+        only the files holding changes"""
+        storage = FileStorage()
+        state = State(name="FT43")
+        state.save()
+        objects = FileStorage._FileStorage__objects
+
+        def cold_start():
+            FileStorage._FileStorage__objects = {}
+            FileStorage._FileStorage__loaded = set()
+            FileStorage._FileStorage__on_disk = set()
+            FileStorage._FileStorage__pending = set()
+            FileStorage._FileStorage__shard_stamps = {}
+
+        modes = (FileStorage._FileStorage__sharded,
+                 FileStorage._FileStorage__shard_counts,
+                 FileStorage._FileStorage__loaded,
+                 FileStorage._FileStorage__shard_stamps,
+                 FileStorage._FileStorage__lock)
+        FileStorage._FileStorage__sharded = True
+        FileStorage._FileStorage__shard_counts = {"Review": 2}
+        FileStorage._FileStorage__lock = locks.ReadWriteLock()
+        try:
+            cold_start()
+            self.assertEqual(storage.get(State, state.id).name, "FT43")
+            amenity = Amenity(name="Wifi")
+            amenity.save()
+            self.assertTrue(os.path.exists("file.State.json"))
+            reviews = [Review(text=str(i)) for i in range(4)]
+            for review in reviews:
+                storage.new(review)
+            storage.save()
+            for review in reviews:
+                shard = file_storage.crc32(review.id.encode()) % 2
+                with open("file.Review.{}.json".format(shard), "r") as f:
+                    self.assertIn("Review." + review.id, json.load(f))
+            cold_start()
+            state = storage.get(State, state.id)
+            self.assertEqual(FileStorage._FileStorage__loaded, {"State"})
+            amenity_stat = os.stat("file.Amenity.json")
+            state.name = "California"
+            state.save()
+            self.assertEqual(os.stat("file.Amenity.json"), amenity_stat)
+            cold_start()
+            self.assertEqual(storage.get(State, state.id).name, "California")
+            self.assertEqual(storage.count(Review), 4)
+            cold_start()
+            self.assertEqual(storage.count(), sum(storage.counts().values()))
+            self.assertEqual(storage.count(Review), 4)
+            cold_start()
+            self.assertEqual(storage.search_places(states=[state.id]), [])
+        finally:
+            (FileStorage._FileStorage__sharded,
+             FileStorage._FileStorage__shard_counts,
+             FileStorage._FileStorage__loaded,
+             FileStorage._FileStorage__shard_stamps,
+             FileStorage._FileStorage__lock) = modes
+            FileStorage._FileStorage__objects = objects
+            FileStorage._FileStorage__on_disk = set(objects)
+            for name in os.listdir("."):
+                if (name.startswith("file.") and name.endswith(".json") and
+                        name != "file.json"):
+                    os.remove(name)
+
     @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
     def test_count(self):
         """Test that count properly counts the number of objects in storage"""
@@ -140,6 +871,17 @@ class TestFileStorage(unittest.TestCase):
         c = storage.count()
         self.assertEqual(len(storage.all()), c)
 
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_counts(self):
+        """Test that counts gives the count of every class at once"""
+        storage = FileStorage()
+        storage.new(State(name="FT43"))
+        counts = storage.counts()
+        self.assertEqual(set(counts), set(classes))
+        for key, value in classes.items():
+            self.assertEqual(counts[key], storage.count(value))
+        self.assertEqual(sum(counts.values()), storage.count())
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+"""
+Contains the TestJsonStreamDocs and TestIterload classes
+"""
+
+import io
+import json
+from models.engine import json_stream
+import pep8
+import unittest
+iterload = json_stream.iterload
+
+
+class TestJsonStreamDocs(unittest.TestCase):
+    """Tests to check the documentation and style of json_stream"""
+    def test_pep8_conformance_json_stream(self):
+        """Test that models/engine/json_stream.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/json_stream.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_json_stream(self):
+        """Test tests/test_models/test_json_stream.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_json_stream.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_json_stream_module_docstring(self):
+        """Test for the json_stream.py module docstring"""
+        self.assertIsNot(json_stream.__doc__, None,
+                         "json_stream.py needs a docstring")
+        self.assertTrue(len(json_stream.__doc__) >= 1,
+                        "json_stream.py needs a docstring")
+
+    def test_iterload_docstring(self):
+        """Test for the iterload docstring"""
+        self.assertIsNot(iterload.__doc__, None,
+                         "iterload needs a docstring")
+        self.assertTrue(len(iterload.__doc__) >= 1,
+                        "iterload needs a docstring")
+
+
+class TestIterload(unittest.TestCase):
+    """Test the iterload function"""
+    def test_chunk_sizes(self):
+        """Test that members split across chunks are decoded whole"""
+        jo = {"State.1": {"name": "Cali}fornia", "id": "1"},
+              "n": 12345, "t": True, "l": [1, "}", None]}
+        text = " " + json.dumps(jo, indent=2) + "\n"
+        for chunk_size in (1, 2, 3, 7, 4096):
+            self.assertEqual(list(iterload(io.StringIO(text), chunk_size)),
+                             list(jo.items()))
+
+    def test_number_boundaries(self):
+        """Test that numbers are decoded whole wherever a chunk ends"""
+        text = ('{"a": 1.5, "b": 1, "c": -2.25e-3, "d": 6E+2, "e": 0,'
+                ' "f": [10.0, 1e5, -7], "g": 123456789}')
+        jo = json.loads(text)
+        for chunk_size in range(1, len(text) + 2):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(list(iterload(io.StringIO(text),
+                                               chunk_size)),
+                                 list(jo.items()))
+
+    def test_empty(self):
+        """Test that an empty object yields nothing"""
+        self.assertEqual(list(iterload(io.StringIO("{ }"), 1)), [])
+
+    def test_invalid(self):
+        """Test that text that is not a whole JSON object raises"""
+        for text in ("", "[1]", '{"a": 1', '{"a" 1}', '{1: 2}', '{"a": 1]'):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    list(iterload(io.StringIO(text), 2))
@@ -0,0 +1,107 @@
+#!/usr/bin/python3
+"""
+Contains the TestLocksDocs and TestReadWriteLock classes
+"""
+
+import inspect
+from models.engine import locks
+import pep8
+import threading
+import unittest
+ReadWriteLock = locks.ReadWriteLock
+
+
+class TestLocksDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the locks module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.rw_f = inspect.getmembers(ReadWriteLock, inspect.isfunction)
+
+    def test_pep8_conformance_locks(self):
+        """Test that models/engine/locks.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/locks.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_locks(self):
+        """Test tests/test_models/test_locks.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_locks.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_locks_module_docstring(self):
+        """Test for the locks.py module docstring"""
+        self.assertIsNot(locks.__doc__, None,
+                         "locks.py needs a docstring")
+        self.assertTrue(len(locks.__doc__) >= 1,
+                        "locks.py needs a docstring")
+
+    def test_rw_func_docstrings(self):
+        """Test for the presence of docstrings in ReadWriteLock methods"""
+        for func in self.rw_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestReadWriteLock(unittest.TestCase):
+    """Test the ReadWriteLock class"""
+    def test_readers_share(self):
+        """Test that two threads can hold the read side together"""
+        lock = ReadWriteLock()
+        entered = threading.Event()
+
+        def reader():
+            with lock.read:
+                entered.set()
+
+        with lock.read:
+            thread = threading.Thread(target=reader)
+            thread.start()
+            self.assertTrue(entered.wait(5))
+        thread.join()
+
+    def test_writer_excludes_readers(self):
+        """Test that a reader waits for the writer to finish"""
+        lock = ReadWriteLock()
+        entered = threading.Event()
+
+        def reader():
+            with lock.read:
+                entered.set()
+
+        with lock.write:
+            thread = threading.Thread(target=reader)
+            thread.start()
+            self.assertFalse(entered.wait(0.1))
+        self.assertTrue(entered.wait(5))
+        thread.join()
+
+    def test_reentrant(self):
+        """Test that the writer can take both sides again"""
+        lock = ReadWriteLock()
+        with lock.write:
+            with lock.write:
+                with lock.read:
+                    pass
+        with lock.read:
+            with lock.read:
+                pass
+        with lock.write:
+            pass
+
+    def test_no_upgrade(self):
+        """Test that a reader cannot take the write side"""
+        lock = ReadWriteLock()
+        with lock.read:
+            with self.assertRaises(RuntimeError):
+                lock.acquire_write()
+
+
+if __name__ == '__main__':
+    unittest.main()
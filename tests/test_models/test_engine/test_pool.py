@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+"""
+Contains the TestPoolDocs and TestPool classes
+"""
+
+from models.engine import pool
+import os
+import pep8
+from sqlalchemy import create_engine, exc
+import unittest
+from unittest import mock
+
+
+class TestPoolDocs(unittest.TestCase):
+    """Tests to check the documentation and style of pool"""
+    def test_pep8_conformance_pool(self):
+        """Test that models/engine/pool.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/pool.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_pool(self):
+        """Test tests/test_models/test_pool.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_pool.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pool_module_docstring(self):
+        """Test for the pool.py module docstring"""
+        self.assertIsNot(pool.__doc__, None,
+                         "pool.py needs a docstring")
+        self.assertTrue(len(pool.__doc__) >= 1,
+                        "pool.py needs a docstring")
+
+    def test_pool_docstrings(self):
+        """Test for the docstrings of options and MeteredQueuePool"""
+        for obj in (pool.options, pool.MeteredQueuePool,
+                    pool.MeteredQueuePool.stats):
+            self.assertIsNot(obj.__doc__, None,
+                             "{:s} needs a docstring".format(obj.__name__))
+            self.assertTrue(len(obj.__doc__) >= 1,
+                            "{:s} needs a docstring".format(obj.__name__))
+
+
+class TestPool(unittest.TestCase):
+    """Test the configuration of the connection pool"""
+    def test_options(self):
+        """Test that the HBNB_DB_POOL_* variables set the pool up"""
+        env = {"HBNB_DB_POOL_SIZE": "8", "HBNB_DB_MAX_OVERFLOW": "0",
+               "HBNB_DB_POOL_TIMEOUT": "2.5", "HBNB_DB_POOL_RECYCLE": "",
+               "HBNB_DB_POOL_PRE_PING": "1"}
+        with mock.patch.dict(os.environ, env):
+            self.assertEqual(pool.options(),
+                             {"poolclass": pool.MeteredQueuePool,
+                              "pool_size": 8, "max_overflow": 0,
+                              "pool_timeout": 2.5, "pool_pre_ping": True})
+
+    def test_stats(self):
+        """Test that the pool counts checkouts, overflow and timeouts"""
+        engine = create_engine("sqlite://", pool_size=1, max_overflow=1,
+                               pool_timeout=0.01,
+                               poolclass=pool.MeteredQueuePool)
+        first = engine.connect()
+        second = engine.connect()
+        stats = engine.pool.stats()
+        self.assertEqual((stats["checked_out"], stats["overflow"],
+                          stats["checkouts"]), (2, 1, 2))
+        with self.assertRaises(exc.TimeoutError):
+            engine.connect()
+        first.close()
+        second.close()
+        stats = engine.pool.stats()
+        self.assertEqual((stats["checked_out"], stats["timeouts"]), (0, 1))
+        self.assertGreaterEqual(stats["max_wait_seconds"], 0.01)
+        engine.dispose()
@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+"""
+Contains the TestQueryDocs and TestQuery classes
+"""
+
+from models.engine import query
+import pep8
+import unittest
+
+
+class TestQueryDocs(unittest.TestCase):
+    """Tests to check the documentation and style of query"""
+    def test_pep8_conformance_query(self):
+        """Test that models/engine/query.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/query.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_query(self):
+        """Test tests/test_models/test_query.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_query.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_query_module_docstring(self):
+        """Test for the query.py module docstring"""
+        self.assertIsNot(query.__doc__, None,
+                         "query.py needs a docstring")
+        self.assertTrue(len(query.__doc__) >= 1,
+                        "query.py needs a docstring")
+
+    def test_query_func_docstrings(self):
+        """Test for the parse and matches docstrings"""
+        for func in (query.parse, query.matches):
+            self.assertIsNot(func.__doc__, None,
+                             "{:s} needs a docstring".format(func.__name__))
+            self.assertTrue(len(func.__doc__) >= 1,
+                            "{:s} needs a docstring".format(func.__name__))
+
+
+class TestQuery(unittest.TestCase):
+    """Test the parse and matches functions"""
+    def test_parse(self):
+        """Test that conditions are split into attribute and operator"""
+        self.assertEqual(query.parse({"name": "CA", "state_id__in": ("1",),
+                                      "price_by_night__le": 10}),
+                         [("name", "eq", "CA"), ("state_id", "in", ["1"]),
+                          ("price_by_night", "le", 10)])
+        with self.assertRaises(ValueError):
+            query.parse({"name__like": "C%"})
+
+    def test_matches(self):
+        """Test each operator, on single values and collections"""
+        self.assertTrue(query.matches("CA", "eq", "CA"))
+        self.assertTrue(query.matches(None, "eq", None))
+        self.assertTrue(query.matches(2, "in", [1, 2]))
+        self.assertTrue(query.matches(1, "lt", 2))
+        self.assertTrue(query.matches(2, "le", 2))
+        self.assertFalse(query.matches(2, "gt", 2))
+        self.assertTrue(query.matches(2, "ge", 2))
+        self.assertFalse(query.matches(None, "lt", 2))
+        self.assertFalse(query.matches("2", "ge", 2))
+        self.assertTrue(query.matches({"a", "b"}, "eq", "a"))
+        self.assertTrue(query.matches(["a", "b"], "in", ["c", "b"]))
+        self.assertFalse(query.matches(["a"], "lt", "b"))
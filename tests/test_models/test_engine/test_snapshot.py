@@ -0,0 +1,140 @@
+#!/usr/bin/python3
+"""
+Contains the TestSnapshotDocs and TestSnapshot classes
+"""
+
+from datetime import datetime
+import inspect
+import json
+from models.engine import snapshot
+import os
+import pep8
+import unittest
+Snapshot = snapshot.Snapshot
+
+
+class TestSnapshotDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the snapshot module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.snapshot_f = inspect.getmembers(Snapshot, inspect.isfunction)
+
+    def test_pep8_conformance_snapshot(self):
+        """Test that models/engine/snapshot.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/snapshot.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_snapshot(self):
+        """Test tests/test_models/test_snapshot.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_snapshot.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_snapshot_module_docstring(self):
+        """Test for the snapshot.py module docstring"""
+        self.assertIsNot(snapshot.__doc__, None,
+                         "snapshot.py needs a docstring")
+        self.assertTrue(len(snapshot.__doc__) >= 1,
+                        "snapshot.py needs a docstring")
+
+    def test_snapshot_func_docstrings(self):
+        """Test for the presence of docstrings in Snapshot methods"""
+        for func in self.snapshot_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestSnapshot(unittest.TestCase):
+    """Test the snapshot format"""
+    records = {
+        "State.2": {"__class__": "State", "id": "2", "name": "Texas",
+                    "created_at": "2017-06-14T22:31:03.285259",
+                    "updated_at": "2017-06-14T22:31:03.285259"},
+        "State.1": {"__class__": "State", "id": "1",
+                    "created_at": datetime(2017, 6, 14, 22, 31, 3),
+                    "updated_at": datetime(2017, 6, 15, 1, 2, 3, 4)},
+        "Place.3": {"__class__": "Place", "id": "3", "name": "Loft",
+                    "amenity_ids": ["a", "b"], "latitude": 1.5,
+                    "max_guest": 4, "description": None,
+                    "created_at": "2017-06-14T22:31:03.285259",
+                    "updated_at": "2017-06-14T22:31:03.285259"}}
+
+    def setUp(self):
+        """Write the records to a snapshot"""
+        with open("test.snap", "wb") as f:
+            f.writelines(snapshot.dump(self.records.items()))
+
+    def tearDown(self):
+        """Remove the files written by the tests"""
+        for path in ("test.snap", "test.json"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def expected(self, key):
+        """returns the record stored under key, with datetime timestamps"""
+        record = dict(self.records[key])
+        for attr in snapshot.timestamps:
+            if type(record[attr]) is str:
+                record[attr] = datetime.strptime(record[attr],
+                                                 "%Y-%m-%dT%H:%M:%S.%f")
+        return record
+
+    def test_iter(self):
+        """Test that a snapshot yields back every record, by key"""
+        self.assertTrue(snapshot.is_snapshot("test.snap"))
+        with Snapshot("test.snap") as snap:
+            self.assertEqual(len(snap), 3)
+            pairs = list(snap)
+        self.assertEqual([key for key, record in pairs],
+                         sorted(self.records))
+        for key, record in pairs:
+            self.assertEqual(record, self.expected(key))
+
+    def test_get(self):
+        """Test that get finds a record by key, or returns None"""
+        with Snapshot("test.snap") as snap:
+            for key in self.records:
+                self.assertEqual(snap.get(key), self.expected(key))
+            self.assertIsNone(snap.get("State.0"))
+            self.assertIsNone(snap.get("User.1"))
+
+    def test_not_a_snapshot(self):
+        """Test that other files are not taken for snapshots"""
+        with open("test.json", "w") as f:
+            f.write("{}")
+        self.assertFalse(snapshot.is_snapshot("test.json"))
+        self.assertFalse(snapshot.is_snapshot("nothing.snap"))
+        with self.assertRaises(ValueError):
+            Snapshot("test.json")
+
+    def test_convert(self):
+        """Test that convert turns a snapshot to JSON and back"""
+        snapshot.convert("test.snap", "test.json")
+        with open("test.json", "r") as f:
+            jo = json.load(f)
+        self.assertEqual(jo["State.2"], self.records["State.2"])
+        self.assertEqual(jo["State.1"]["updated_at"],
+                         "2017-06-15T01:02:03.000004")
+        os.remove("test.snap")
+        snapshot.convert("test.json", "test.snap")
+        with Snapshot("test.snap") as snap:
+            self.assertEqual(snap.get("Place.3"), self.expected("Place.3"))
+
+    def test_compressed(self):
+        """Test that a compressed snapshot reads as the plain one"""
+        snapshot.convert("test.snap", "test.json")
+        snapshot.convert("test.json", "test.snap.gz")
+        try:
+            self.assertTrue(snapshot.is_snapshot("test.snap.gz"))
+            with Snapshot("test.snap.gz") as snap:
+                self.assertEqual(snap.get("State.1"), self.expected("State.1"))
+                self.assertEqual(len(list(snap)), 3)
+        finally:
+            os.remove("test.snap.gz")
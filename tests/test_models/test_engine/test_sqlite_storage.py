@@ -0,0 +1,99 @@
+#!/usr/bin/python3
+"""
+Contains the TestSQLiteStorageDocs and TestSQLiteStorage classes
+"""
+
+import inspect
+import models
+from models.engine import sqlite_storage
+from models.state import State
+import os
+import pep8
+import sqlite3
+import unittest
+SQLiteStorage = sqlite_storage.SQLiteStorage
+
+
+class TestSQLiteStorageDocs(unittest.TestCase):
+    """Tests to check the documentation and style of SQLiteStorage class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.sqs_f = inspect.getmembers(SQLiteStorage, inspect.isfunction)
+
+    def test_pep8_conformance_sqlite_storage(self):
+        """Test that models/engine/sqlite_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/sqlite_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_sqlite_storage(self):
+        """Test tests/test_models/test_sqlite_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_sqlite_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_sqlite_storage_module_docstring(self):
+        """Test for the sqlite_storage.py module docstring"""
+        self.assertIsNot(sqlite_storage.__doc__, None,
+                         "sqlite_storage.py needs a docstring")
+        self.assertTrue(len(sqlite_storage.__doc__) >= 1,
+                        "sqlite_storage.py needs a docstring")
+
+    def test_sqlite_storage_class_docstring(self):
+        """Test for the SQLiteStorage class docstring"""
+        self.assertIsNot(SQLiteStorage.__doc__, None,
+                         "SQLiteStorage class needs a docstring")
+        self.assertTrue(len(SQLiteStorage.__doc__) >= 1,
+                        "SQLiteStorage class needs a docstring")
+
+    def test_sqs_func_docstrings(self):
+        """Test for the presence of docstrings in SQLiteStorage methods"""
+        for func in self.sqs_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_engine != 'sqlite', "not testing sqlite")
+class TestSQLiteStorage(unittest.TestCase):
+    """Test the SQLiteStorage class"""
+    def setUp(self):
+        """Open a connection of its own to the database"""
+        self.conn = sqlite3.connect(os.getenv('HBNB_SQLITE_DB') or "hbnb.db",
+                                    isolation_level=None)
+
+    def tearDown(self):
+        """Close the connection"""
+        self.conn.close()
+
+    def test_wal(self):
+        """Test that the database is in write-ahead log mode"""
+        mode = self.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+    def test_indexes(self):
+        """Test that the foreign keys of reviews are indexed"""
+        columns = set()
+        for index in self.conn.execute("PRAGMA index_list(reviews)"):
+            info = self.conn.execute("PRAGMA index_info({})".format(
+                index[1])).fetchall()
+            columns.update(column[2] for column in info)
+        self.assertTrue({"place_id", "user_id", "created_at"} <= columns)
+
+    def test_concurrent_reader(self):
+        """Test that a commit goes through while another connection is
+        reading, which keeps seeing the rows as they were"""
+        query = "SELECT count(*) FROM states"
+        self.conn.execute("BEGIN")
+        before = self.conn.execute(query).fetchone()[0]
+        state = State(name="Nevada")
+        state.save()
+        self.assertEqual(self.conn.execute(query).fetchone()[0], before)
+        self.conn.execute("COMMIT")
+        self.assertEqual(self.conn.execute(query).fetchone()[0], before + 1)
+        self.assertIs(models.storage.get(State, state.id), state)
@@ -165,11 +165,32 @@ class TestPlace(unittest.TestCase):
 
     @unittest.skipIf(models.storage_t == 'db', "not testing File Storage")
     def test_amenity_ids_attr(self):
-        """Test Place has attr amenity_ids, and it's an empty list"""
+        """Test Place has attr amenity_ids, and it's an empty set"""
         place = Place()
         self.assertTrue(hasattr(place, "amenity_ids"))
-        self.assertEqual(type(place.amenity_ids), list)
+        self.assertEqual(type(place.amenity_ids), set)
         self.assertEqual(len(place.amenity_ids), 0)
+        self.assertIsNot(place.amenity_ids, Place().amenity_ids)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing File Storage")
+    def test_amenity_ids_to_dict(self):
+        """Test amenity_ids is given as a list by to_dict"""
+        place = Place(amenity_ids=["b", "a"])
+        self.assertEqual(place.amenity_ids, {"a", "b"})
+        self.assertEqual(place.to_dict()["amenity_ids"], ["a", "b"])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing File Storage")
+    def test_amenity_ids_setattr(self):
+        """Test amenity_ids stays a set of ids whatever it's set to"""
+        place = Place(amenity_ids=["a", ["b"], {"c": 1}, 2])
+        self.assertEqual(place.amenity_ids, {"a", 2})
+        self.assertEqual(place.to_dict()["amenity_ids"], [2, "a"])
+        place.amenity_ids = []
+        self.assertEqual(place.amenity_ids, set())
+        place.amenity_ids = "a"
+        self.assertEqual(place.amenity_ids, {"a"})
+        place.amenity_ids = None
+        self.assertEqual(place.amenity_ids, set())
 
     def test_to_dict_creates_dict(self):
         """test to_dict method creates a dictionary with proper attrs"""